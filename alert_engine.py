@@ -0,0 +1,79 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from sensor_store import TEMP, RISK_LEVELS
+
+
+def alert_message(severity, last_temp):
+    if severity == "High":
+        return "Bearing temp high" if last_temp > 85 else "Vibration above normal"
+    return "Temperature rising" if last_temp > 77 else "Vibration above normal"
+
+
+# ----- Incremental alert engine -----
+# Keeps one alert state per machine and only re-evaluates machines that got new
+# samples since the last update. A level is raised once the last `raise_after`
+# samples are all at or above it (debounce) and only cleared once the last
+# `clear_after` samples are all below it (hysteresis), so noisy machines
+# hovering on a threshold don't flap. Every transition is emitted as an event
+# and the KPI counters are adjusted from those events.
+class AlertEngine:
+    def __init__(self, store, raise_after=2, clear_after=3, history=200):
+        self.store = store
+        self.raise_after = raise_after
+        self.clear_after = clear_after
+        n = len(store.machine_names)
+        self.seen = np.zeros(n, dtype=np.int64)  # store.versions at the last update
+        self.severity = np.zeros(n, dtype=np.int8)
+        self.alerts = {}
+        self.counts = {"High": 0, "Medium": 0}
+        self.events = deque(maxlen=history)
+
+    def update(self):
+        with self.store.lock:
+            changed = np.flatnonzero(self.store.versions != self.seen)
+            if not changed.size:
+                return []
+            window = max(self.raise_after, self.clear_after)
+            codes, _ = self.store.matrix("Risk", window, rows=changed)
+            temps = self.store.latest_fleet(changed)[TEMP]
+            self.seen[changed] = self.store.versions[changed]
+
+        sustained = codes[:, -self.raise_after:].min(axis=1)
+        recent_peak = codes[:, -self.clear_after:].max(axis=1)
+        current = self.severity[changed]
+        new = np.where(sustained > current, sustained,
+                       np.where(recent_peak < current, recent_peak, current))
+
+        events = []
+        now = time.strftime('%H:%M')
+        for j in np.flatnonzero(new != current):
+            i = changed[j]
+            name = self.store.machine_names[i]
+            old_level, level = RISK_LEVELS[current[j]], RISK_LEVELS[new[j]]
+            if old_level in self.counts:
+                self.counts[old_level] -= 1
+            if level in self.counts:
+                self.counts[level] += 1
+                self.alerts[name] = {
+                    "Machine": name,
+                    "Alert": alert_message(level, temps[j]),
+                    "Severity": level,
+                    "Time": now
+                }
+                kind = "raise" if current[j] == 0 else "escalate" if new[j] > current[j] else "downgrade"
+            else:
+                self.alerts.pop(name, None)
+                kind = "clear"
+            events.append({"Time": now, "Machine": name, "Event": kind, "From": old_level, "To": level})
+        self.severity[changed] = new
+        self.events.extend(events)
+        return events
+
+    def active(self):
+        return list(self.alerts.values())
+
+    def active_count(self):
+        return self.counts["High"] + self.counts["Medium"]
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from alert_engine import AlertEngine
+from fleet import FleetRegistry
+from risk_engine import RISK_WINDOW, score_fleet
+from sensor_store import SensorStore, TEMP, VIB
+from simulator import FleetSimulator, simulate_machine_profile
+
+PAGE = Path(__file__).parent / "Smart-Predictive-Maintenace-Dashboard-.py"
+ROLES = ("Operator", "Maintenance", "Supervisor")
+HEADING = re.compile(r"<h[1-4][^>]*>(.*?)</h[1-4]>")
+
+
+def percentiles(samples):
+    samples = np.asarray(samples, dtype=np.float64)
+    return {"p50_ms": round(float(np.percentile(samples, 50)) * 1000, 2),
+            "p95_ms": round(float(np.percentile(samples, 95)) * 1000, 2),
+            "runs": int(len(samples))}
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return percentiles(times)
+
+
+# ----- Kernel benchmarks: the per-rerun hot paths, without Streamlit -----
+def bench_kernels(machines, history, repeat):
+    rng = np.random.default_rng(0)
+    registry = FleetRegistry(machines)
+    store = SensorStore(registry.names, history)
+    simulator = FleetSimulator(store, registry.profiles, seed=0)
+    now = pd.Timestamp("2025-01-01")
+    simulator.tick(now)
+    alerts = AlertEngine(store)
+    alerts.update()
+    steps = np.broadcast_to(np.arange(history), (machines, history))
+    temps, valid = store.matrix(TEMP, RISK_WINDOW)
+    vibs, _ = store.matrix(VIB, RISK_WINDOW)
+    page = registry.names[:4]
+
+    def tick_and_alert():
+        nonlocal now
+        now += pd.Timedelta(minutes=1)
+        simulator.tick(now)
+        alerts.update()
+
+    results = {
+        "simulate_machine_profile": timed(lambda: simulate_machine_profile("degrading", steps, rng), repeat),
+        "predict_failure_risk": timed(lambda: score_fleet(temps, vibs, valid), repeat),
+        "random_alerts": timed(tick_and_alert, repeat),
+        "trend_frames": timed(lambda: [store.frame(name, 30) for name in page], repeat),
+    }
+    return [{"kernel": name, "machines": machines, "history": history, **stats} for name, stats in results.items()]
+
+
+# ----- Page benchmarks: full script runs through AppTest -----
+def section_payloads(at):
+    # Serialized element bytes grouped by the heading each top-level element follows
+    sizes = {"sidebar": 0}
+    section = "header"
+
+    def size(node):
+        proto = getattr(node, "proto", None)
+        total = proto.ByteSize() if hasattr(proto, "ByteSize") else 0
+        return total + sum(size(child) for child in getattr(node, "children", {}).values())
+
+    for child in at.sidebar.children.values():
+        sizes["sidebar"] += size(child)
+    for child in at.main.children.values():
+        if type(child).__name__ == "Markdown":
+            match = HEADING.search(child.value)
+            if match:
+                section = match.group(1)
+        sizes[section] = sizes.get(section, 0) + size(child)
+    return sizes
+
+
+def open_session(role, machines, history, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(PAGE), default_timeout=timeout)
+    at.query_params["history"] = str(history)
+    at.run()
+    [w for w in at.sidebar.number_input if w.label == "Machines in Fleet"][0].set_value(machines)
+    [w for w in at.sidebar.selectbox if w.label == "Select Role"][0].set_value(role)
+    return at
+
+
+def bench_page(role, machines, history, sessions, runs, timeout):
+    started = time.perf_counter()
+    apps = [open_session(role, machines, history, timeout) for _ in range(sessions)]
+    for at in apps:
+        at.run()
+    cold = time.perf_counter() - started
+    errors = [e.value for at in apps for e in at.exception]
+
+    # AppTest drives a process-global test runtime, so sessions can't rerun on
+    # parallel threads; they take turns instead, one rerun each per round, which
+    # still exercises everything they share (caches, ticker, shared state)
+    times, rounds = [], []
+    for _ in range(runs):
+        round_started = time.perf_counter()
+        for at in apps:
+            t = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - t)
+        rounds.append(time.perf_counter() - round_started)
+    errors += [e.value for at in apps for e in at.exception]
+
+    # One extra run under tracemalloc (kept out of the timings, it slows allocation)
+    tracemalloc.start()
+    apps[0].run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    errors += [e.value for e in apps[0].exception]
+    return {
+        "role": role, "machines": machines, "history": history, "sessions": sessions,
+        "cold_start_ms": round(cold * 1000, 2), **percentiles(times),
+        "round_p50_ms": percentiles(rounds)["p50_ms"], "round_p95_ms": percentiles(rounds)["p95_ms"],
+        "peak_traced_mb": round(peak / 2**20, 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+        "payload_bytes": section_payloads(apps[0]),
+        "errors": errors,
+    }
+
+
+# ----- Startup benchmark: the first render of a freshly started server -----
+def startup_probe(timeout):
+    # Runs in a fresh interpreter, so the first run pays every import and cache build
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(PAGE), default_timeout=timeout)
+    started = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    at.run()
+    print(json.dumps({"first_render": first, "warm_rerun": time.perf_counter() - started,
+                      "errors": [e.value for e in at.exception]}))
+
+
+def bench_startup(runs, timeout):
+    rows = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        out = subprocess.run([sys.executable, __file__, "--startup-probe", "--timeout", str(timeout)],
+                             capture_output=True, text=True, check=True)
+        rows.append({**json.loads(out.stdout.strip().splitlines()[-1]), "process": time.perf_counter() - started})
+    first, warm, process = (percentiles([row[key] for row in rows]) for key in ("first_render", "warm_rerun", "process"))
+    return {
+        "runs": runs,
+        "first_render_p50_ms": first["p50_ms"], "first_render_p95_ms": first["p95_ms"],
+        "warm_rerun_p50_ms": warm["p50_ms"], "process_p50_ms": process["p50_ms"],
+        "errors": [e for row in rows for e in row["errors"]],
+    }
+
+
+def csv_ints(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard render path and its hot kernels.")
+    parser.add_argument("--roles", default=",".join(ROLES), help="comma-separated roles to render")
+    parser.add_argument("--machines", type=csv_ints, default=[4, 100, 1000], help="fleet sizes, e.g. 4,100,1000")
+    parser.add_argument("--history", type=csv_ints, default=[120], help="live window lengths in samples")
+    parser.add_argument("--sessions", type=csv_ints, default=[1], help="AppTest sessions sharing the server process")
+    parser.add_argument("--runs", type=int, default=10, help="timed reruns per session")
+    parser.add_argument("--repeat", type=int, default=50, help="repetitions per kernel")
+    parser.add_argument("--timeout", type=float, default=120, help="AppTest script timeout in seconds")
+    parser.add_argument("--skip-page", action="store_true", help="only run the kernel benchmarks")
+    parser.add_argument("--startup-runs", type=int, default=3, help="fresh-interpreter cold starts to time (0 skips)")
+    parser.add_argument("--startup-probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+    if args.startup_probe:
+        return startup_probe(args.timeout)
+    # The page (and the startup probes, which inherit this) writes its history and
+    # tickets under a scratch root, and only honours ?history= with PDM_BENCHMARK set
+    scratch = tempfile.mkdtemp(prefix="pdm-bench-")
+    os.environ.update(PDM_DATA_ROOT=scratch, PDM_BENCHMARK="1")
+    try:
+        run(args)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def run(args):
+    report = {
+        "meta": {"started": str(pd.Timestamp.now()), "python": platform.python_version(),
+                 "numpy": np.__version__, "machine": platform.machine()},
+        "kernels": [],
+        "pages": [],
+    }
+    if args.startup_runs and not args.skip_page:
+        report["startup"] = bench_startup(args.startup_runs, args.timeout)
+        print(f"startup first render p50 {report['startup']['first_render_p50_ms']} ms  "
+              f"p95 {report['startup']['first_render_p95_ms']} ms  "
+              f"warm rerun p50 {report['startup']['warm_rerun_p50_ms']} ms"
+              + (f"  errors {len(report['startup']['errors'])}" if report["startup"]["errors"] else ""))
+    for machines in args.machines:
+        for history in args.history:
+            report["kernels"] += bench_kernels(machines, history, args.repeat)
+            for row in report["kernels"][-4:]:
+                print(f"kernel {row['kernel']:<26} n={machines:<5} h={history:<5} "
+                      f"p50 {row['p50_ms']:>8} ms  p95 {row['p95_ms']:>8} ms")
+    if not args.skip_page:
+        for role in args.roles.split(","):
+            for machines in args.machines:
+                for history in args.history:
+                    for sessions in args.sessions:
+                        row = bench_page(role, machines, history, sessions, args.runs, args.timeout)
+                        report["pages"].append(row)
+                        print(f"page {role:<12} n={machines:<5} h={history:<5} s={sessions:<3} "
+                              f"p50 {row['p50_ms']:>8} ms  p95 {row['p95_ms']:>8} ms  "
+                              f"peak {row['peak_traced_mb']} MB  payload {sum(row['payload_bytes'].values())} B"
+                              + (f"  errors {len(row['errors'])}" if row["errors"] else ""))
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"-> {args.output}")
+
+
+# The guard matters: the inference pool forks worker processes
+if __name__ == "__main__":
+    main()
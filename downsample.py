@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from sensor_store import TEMP, VIB
+
+TREND_SPANS = {"2 hours": "2h", "24 hours": "24h", "7 days": "7D"}
+
+
+# ----- Incremental min/max downsampling for trend charts -----
+# Every zoom level splits its span into `budget` fixed-width, epoch-aligned
+# buckets and keeps a per-machine ring of bucket min/max for each channel. New
+# samples are folded into their bucket as they arrive (one ufunc.at pass for the
+# whole fleet), so a chart of 7 days costs the same 2 x budget points as one of
+# 2 hours and peaks are never averaged away. Buckets outlive the raw ring
+# buffer; levels longer than it can be back-filled from the on-disk rollups.
+class TrendIndex:
+    def __init__(self, store, spans=TREND_SPANS, budget=60):
+        self.store = store
+        self.budget = budget
+        self.lock = threading.Lock()
+        n = len(store.machine_names)
+        self.seen = np.zeros(n, dtype=np.int64)
+        self.seen_versions = np.zeros(n, dtype=np.int64)
+        self.seeded = set()
+        self.levels = {}
+        for label, span in spans.items():
+            span = pd.Timedelta(span).value
+            self.levels[label] = {
+                "span": span,
+                "width": span // budget,
+                "start": np.full((n, budget + 1), -1, dtype=np.int64),
+                "min": {ch: np.full((n, budget + 1), np.inf) for ch in (TEMP, VIB)},
+                "max": {ch: np.full((n, budget + 1), -np.inf) for ch in (TEMP, VIB)},
+            }
+
+    def _fold(self, level, rows, times, lows, highs):
+        width = level["width"]
+        bucket = times // width
+        slot = bucket % (self.budget + 1)
+        start = bucket * width
+        # A batch can cover several generations of the same ring slot (seeding,
+        # catching up after idle time, rollups): only the newest bucket per slot,
+        # in the batch or already stored, is kept. Older samples fell out of the span.
+        key = rows * (self.budget + 1) + slot
+        slots, inverse = np.unique(key, return_inverse=True)
+        newest = level["start"].ravel()[slots]
+        np.maximum.at(newest, inverse, start)
+        current = start == newest[inverse]
+        rows, slot, start = rows[current], slot[current], start[current]
+        lows = {ch: v[current] for ch, v in lows.items()}
+        highs = {ch: v[current] for ch, v in highs.items()}
+        stale = level["start"][rows, slot] != start
+        # A slot now belongs to a newer bucket: forget what the old one held
+        level["start"][rows[stale], slot[stale]] = start[stale]
+        for ch in (TEMP, VIB):
+            level["min"][ch][rows[stale], slot[stale]] = np.inf
+            level["max"][ch][rows[stale], slot[stale]] = -np.inf
+            np.minimum.at(level["min"][ch], (rows, slot), lows[ch])
+            np.maximum.at(level["max"][ch], (rows, slot), highs[ch])
+
+    def update(self):
+        with self.store.lock:
+            changed = np.flatnonzero(self.store.versions != self.seen_versions)
+            if not changed.size:
+                return 0
+            written = self.store.written[changed]
+            # A reset window (written not ahead of what was seen) replaces the
+            # machine's buckets and is folded in whole
+            rebuilt = changed[written <= self.seen[changed]]
+            fresh = np.minimum(np.where(written > self.seen[changed], written - self.seen[changed], written),
+                               self.store.capacity)
+            k = int(fresh.max())
+            times, _ = self.store.matrix("Time", k, rows=changed)
+            values = {ch: self.store.matrix(ch, k, rows=changed)[0] for ch in (TEMP, VIB)}
+            self.seen[changed] = written
+            self.seen_versions[changed] = self.store.versions[changed]
+        mask = np.arange(k) >= k - fresh[:, None]
+        rows = np.broadcast_to(changed[:, None], mask.shape)[mask]
+        times = times[mask].astype(np.int64)
+        values = {ch: v[mask] for ch, v in values.items()}
+        with self.lock:
+            for level in self.levels.values():
+                # Same timestamps as before the reset, so merging would keep the old
+                # peaks (e.g. a repaired machine still charting its degraded maxima)
+                level["start"][rebuilt] = -1
+                for ch in (TEMP, VIB):
+                    level["min"][ch][rebuilt] = np.inf
+                    level["max"][ch][rebuilt] = -np.inf
+                self._fold(level, rows, times, values, values)
+        return int(mask.sum())
+
+    def seed(self, name, history, now):
+        # Back-fill the long zoom levels for one machine from on-disk rollups
+        if name in self.seeded or history is None:
+            return
+        self.seeded.add(name)
+        i = self.store.index[name]
+        for level in self.levels.values():
+            rollup_level = "1min" if level["width"] < 3600 * 10**9 else "1h"
+            records = history.rollup(name, now - pd.Timedelta(level["span"]), now, rollup_level)
+            if records.empty:
+                continue
+            rows = np.full(len(records), i)
+            times = records.index.values.astype(np.int64)
+            lows = {TEMP: records["temp_min"].values, VIB: records["vib_min"].values}
+            highs = {TEMP: records["temp_max"].values, VIB: records["vib_max"].values}
+            with self.lock:
+                self._fold(level, rows, times, lows, highs)
+
+    def frame(self, name, label, now):
+        # Two points per bucket (min at its start, max at its midpoint): at most 2 x (budget + 1) rows
+        level = self.levels[label]
+        i = self.store.index[name]
+        with self.lock:
+            starts = level["start"][i].copy()
+            mins = {ch: level["min"][ch][i].copy() for ch in (TEMP, VIB)}
+            maxs = {ch: level["max"][ch][i].copy() for ch in (TEMP, VIB)}
+        keep = (starts >= pd.Timestamp(now).value - level["span"]) & np.isfinite(mins[TEMP])
+        order = np.flatnonzero(keep)[np.argsort(starts[keep])]
+        times = np.empty(2 * len(order), dtype=np.int64)
+        times[0::2] = starts[order]
+        times[1::2] = starts[order] + level["width"] // 2
+        data = {}
+        for ch in (TEMP, VIB):
+            column = np.empty(2 * len(order))
+            column[0::2] = mins[ch][order]
+            column[1::2] = maxs[ch][order]
+            data[ch] = column
+        return pd.DataFrame(data, index=pd.DatetimeIndex(times.astype("datetime64[ns]"), name="Time"))
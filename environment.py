@@ -0,0 +1,141 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+ENV_TEMP = "Temperature (°F)"
+ENV_HUMIDITY = "Humidity (%)"
+ENV_CO2 = "CO2 (ppm)"
+ENV_CHANNELS = (ENV_TEMP, ENV_HUMIDITY, ENV_CO2)
+# Per channel: plant baseline, zone-to-zone spread, sample noise, clip range, safe range
+ENV_PROFILE = {
+    ENV_TEMP: (70, 2, 0.4, (60, 95), (60, 80)),
+    ENV_HUMIDITY: (47, 4, 0.8, (30, 80), (35, 65)),
+    ENV_CO2: (500, 40, 12, (400, 1200), (400, 600)),
+}
+CO2_GOOD = 600
+
+
+def zone_names(count):
+    return [f"Zone-{i + 1:02d}" for i in range(count)]
+
+
+# ----- Zone-level environmental histories with vectorized anomaly checks -----
+# All zones sample in lockstep into one (channels x zones x 2*capacity) array,
+# written twice like SensorStore so every trailing window is a view. Each new
+# sample is scored against (a) a rolling z-score over the previous `window`
+# samples and (b) an EWMA mean/variance carried incrementally, plus the fixed
+# safe ranges: one NumPy pass per sample covers every channel of every zone.
+class EnvironmentMonitor:
+    def __init__(self, zones, capacity=240, window=30, alpha=0.1, z_threshold=4.0,
+                 period=pd.Timedelta(seconds=10), seed=None):
+        self.zones = list(zones)
+        self.capacity = capacity
+        self.window = window
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.period = np.timedelta64(period.value, "ns")
+        self.rng = np.random.default_rng(seed)
+        shape = (len(ENV_CHANNELS), len(self.zones))
+        self.values = np.full(shape + (2 * capacity,), np.nan)
+        self.times = np.zeros(2 * capacity, dtype="datetime64[ns]")
+        self.written = 0
+        self.ewma = np.full(shape, np.nan)
+        self.ewvar = np.zeros(shape)
+        self.zscore = np.zeros(shape)
+        self.ewma_score = np.zeros(shape)
+        self.anomaly = np.zeros(shape, dtype=bool)
+        self.anomaly_count = np.zeros(len(self.zones), dtype=np.int64)
+        profile = [ENV_PROFILE[ch] for ch in ENV_CHANNELS]
+        self.base = np.array([p[0] for p in profile])[:, None] + \
+            self.rng.normal(0, 1, shape) * np.array([p[1] for p in profile])[:, None]
+        self.noise = np.array([p[2] for p in profile])[:, None]
+        self.clip = np.array([p[3] for p in profile])
+        self.safe = np.array([p[4] for p in profile])
+        self.last_time = None
+        self.lock = threading.Lock()
+
+    def _trailing(self, n):
+        # (channels x zones x n) view of the newest n samples
+        end = self.written % self.capacity + self.capacity
+        return self.values[:, :, end - n:end]
+
+    def simulate(self, k):
+        # Mean-reverting drift per zone plus rare spikes (a door left open, a CO2 leak)
+        samples = np.empty(self.base.shape + (k,))
+        current = self._trailing(1)[:, :, 0] if self.written else self.base
+        for j in range(k):
+            current = current + 0.2 * (self.base - current) + self.rng.normal(0, 1, self.base.shape) * self.noise
+            spikes = self.rng.random(self.base.shape) < 0.002
+            current = np.where(spikes, current + 12 * self.noise, current)
+            samples[:, :, j] = np.clip(current, self.clip[:, :1], self.clip[:, 1:])
+        return samples
+
+    def append(self, times, samples):
+        # samples: (channels x zones x k)
+        for j, t in enumerate(times):
+            x = samples[:, :, j]
+            n = min(self.written, self.window)
+            if n >= 2:
+                recent = self._trailing(n)
+                mean = recent.mean(axis=2)
+                std = recent.std(axis=2)
+                self.zscore = np.where(std > 0, (x - mean) / np.maximum(std, 1e-9), 0.0)
+            if self.written:
+                diff = x - self.ewma
+                self.ewma_score = np.where(self.ewvar > 0, np.abs(diff) / np.sqrt(np.maximum(self.ewvar, 1e-12)), 0.0)
+                self.ewma = self.ewma + self.alpha * diff
+                self.ewvar = (1 - self.alpha) * (self.ewvar + self.alpha * diff ** 2)
+            else:
+                self.ewma = x.copy()
+            # Only trust the statistics once a full window has been seen
+            warm = self.written >= self.window
+            out_of_range = (x < self.safe[:, :1]) | (x > self.safe[:, 1:])
+            self.anomaly = out_of_range | (warm & ((np.abs(self.zscore) > self.z_threshold) |
+                                                   (self.ewma_score > self.z_threshold)))
+            self.anomaly_count += self.anomaly.any(axis=0)
+            slot = self.written % self.capacity
+            self.values[:, :, slot] = x
+            self.values[:, :, slot + self.capacity] = x
+            self.times[slot] = self.times[slot + self.capacity] = t
+            self.written += 1
+
+    def tick(self, now):
+        # Idempotent per period: any number of sessions can call it on every rerun
+        now = np.datetime64(pd.Timestamp(now), "ns")
+        with self.lock:
+            if self.last_time is None:
+                k = self.window
+                self.last_time = now - self.period * k
+            else:
+                k = int((now - self.last_time) // self.period)
+            if k <= 0:
+                return 0
+            keep = min(k, self.capacity)
+            times = self.last_time + self.period * np.arange(k - keep + 1, k + 1)
+            self.append(times, self.simulate(keep))
+            self.last_time = self.last_time + self.period * k
+            return keep
+
+    def summary(self):
+        # One row per zone: latest readings, worst anomaly score and a status
+        with self.lock:
+            latest = self._trailing(1)[:, :, 0].copy()
+            score = np.maximum(np.abs(self.zscore), self.ewma_score)
+            anomaly = self.anomaly.copy()
+            out_of_range = (latest < self.safe[:, :1]) | (latest > self.safe[:, 1:])
+            counts = self.anomaly_count.copy()
+        flagged = np.array([", ".join(ch.split(" ")[0] for ch, hit in zip(ENV_CHANNELS, col) if hit)
+                            for col in anomaly.T])
+        status = np.where(out_of_range.any(axis=0), "Out of range", np.where(anomaly.any(axis=0), "Anomaly", "OK"))
+        return pd.DataFrame({
+            "Zone": self.zones,
+            ENV_TEMP: latest[0].round(1),
+            ENV_HUMIDITY: latest[1].round(1),
+            ENV_CO2: latest[2].round(0).astype(int),
+            "Air": np.where(latest[2] < CO2_GOOD, "Good", "Alert"),
+            "Max Score": score.max(axis=0).round(1),
+            "Flagged": flagged,
+            "Anomalies": counts,
+            "Status": status,
+        })
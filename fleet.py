@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# ------- Realistic Machine Names -------
+MACHINE_TYPES = [
+    "Mixer", "Conveyor", "Pump", "Dryer", "Chiller", "Press",
+    "Blender", "Boiler", "Filter", "Separator"
+]
+
+
+# ----- Fleet registry: names, positions and demo profiles for any fleet size -----
+# Machine i is "<Type>-<i+1>", cycling through MACHINE_TYPES, so the first ten
+# names are the original Mixer-01 ... Separator-10. In every block of ten the
+# third machine degrades and the second drifts, like Pump-03/Conveyor-02 did.
+class FleetRegistry:
+    def __init__(self, size):
+        self.names = [f"{MACHINE_TYPES[i % len(MACHINE_TYPES)]}-{i + 1:02d}" for i in range(size)]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.profiles = {}
+        for i, name in enumerate(self.names):
+            if i % 10 == 2:
+                self.profiles[name] = "degrading"
+            elif i % 10 == 1:
+                self.profiles[name] = "drifting"
+
+    def __len__(self):
+        return len(self.names)
+
+
+def overview_frame(names, latest, risk_percent, risk_levels):
+    return pd.DataFrame({
+        "Machine": names,
+        "Risk": np.asarray(risk_levels)[latest["Risk"]],
+        "Temp (°F)": latest["Temperature (°F)"].round(1),
+        "Vib (g)": latest["Vibration (g)"].round(2),
+        "Predicted Failure Risk": risk_percent,
+    })
+
+
+def heatmap_spec(columns=25):
+    # Vega-Lite spec: one small square per machine, colored by predicted risk
+    return {
+        "height": {"step": 14},
+        "mark": {"type": "rect", "stroke": "#0e1117", "strokeWidth": 1},
+        "transform": [
+            {"window": [{"op": "row_number", "as": "n"}]},
+            {"calculate": f"(datum.n - 1) % {columns}", "as": "col"},
+            {"calculate": f"floor((datum.n - 1) / {columns})", "as": "row"},
+        ],
+        "encoding": {
+            "x": {"field": "col", "type": "ordinal", "axis": None},
+            "y": {"field": "row", "type": "ordinal", "axis": None},
+            "color": {"field": "Predicted Failure Risk", "type": "quantitative",
+                      "scale": {"domain": [0, 100], "scheme": "redyellowgreen", "reverse": True}},
+            "tooltip": [{"field": "Machine"}, {"field": "Risk"}, {"field": "Predicted Failure Risk"}],
+        },
+    }
+
+
+def trend_spec(channels, height=110):
+    # Vega-Lite spec for the per-machine trend panels: one line per channel over
+    # a frame with a "Time" column. Handing Streamlit a plain dict skips building
+    # and schema-validating an Altair chart on every render.
+    return {
+        "height": height,
+        "transform": [{"fold": list(channels), "as": ["Channel", "Value"]}],
+        "mark": {"type": "line", "strokeWidth": 1.5},
+        "encoding": {
+            "x": {"field": "Time", "type": "temporal", "title": None},
+            "y": {"field": "Value", "type": "quantitative", "title": None},
+            "color": {"field": "Channel", "type": "nominal", "legend": {"orient": "bottom", "title": None}},
+            "tooltip": [{"field": "Time", "type": "temporal", "format": "%H:%M"},
+                        {"field": "Channel"}, {"field": "Value", "format": ".2f"}],
+        },
+    }
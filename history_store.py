@@ -0,0 +1,302 @@
+import threading
+import time
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sensor_store import TEMP, VIB
+
+DAY_NS = 86_400 * 10**9
+RAW_FILES = {"Time": ("time.i8", np.int64), TEMP: ("temp.f4", np.float32), VIB: ("vib.f4", np.float32)}
+ROLLUP_LEVELS = {"1min": 60 * 10**9, "1h": 3600 * 10**9, "1d": DAY_NS}
+ROLLUP_DTYPE = np.dtype([
+    ("Time", "i8"), ("count", "i4"),
+    ("temp_min", "f4"), ("temp_max", "f4"), ("temp_mean", "f4"),
+    ("vib_min", "f4"), ("vib_max", "f4"), ("vib_mean", "f4"),
+])
+
+
+def _day(ns):
+    return str(np.datetime64(int(ns), "ns").astype("datetime64[D]"))
+
+
+def _ns(ts):
+    return pd.Timestamp(ts).value
+
+
+def aggregate(times, temps, vibs, step):
+    # min/max/mean per `step`-ns bucket over time-sorted samples, in one reduceat pass
+    out = np.zeros(0, dtype=ROLLUP_DTYPE)
+    if not len(times):
+        return out
+    buckets = times // step * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(times)])
+    out = np.zeros(len(starts), dtype=ROLLUP_DTYPE)
+    out["Time"] = buckets[starts]
+    out["count"] = counts
+    for prefix, values in (("temp", temps), ("vib", vibs)):
+        values = np.asarray(values, dtype=np.float64)
+        out[f"{prefix}_min"] = np.minimum.reduceat(values, starts)
+        out[f"{prefix}_max"] = np.maximum.reduceat(values, starts)
+        out[f"{prefix}_mean"] = np.add.reduceat(values, starts) / counts
+    return out
+
+
+def rollup_frame(records):
+    frame = pd.DataFrame(records)
+    frame["Time"] = pd.to_datetime(frame["Time"], unit="ns")
+    return frame.set_index("Time")
+
+
+# ----- Columnar on-disk history -----
+# Layout: <root>/<machine>/<YYYY-MM-DD>/{time.i8,temp.f4,vib.f4} hold the raw
+# samples as append-only flat columns, read back through np.memmap so a query
+# only pages in the rows and columns it touches. Once a day is over it is
+# compacted into rollup_1min/rollup_1h/rollup_1d.npy next to the raw columns,
+# plus <root>/_fleet/<day>.npy with every machine's daily rollup so fleet-wide
+# summaries over weeks read one small file per day.
+class HistoryStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._last = {}
+        # Every fleet store the sync follows, each with its own written counts
+        self.stores = weakref.WeakSet()
+        self._synced = weakref.WeakKeyDictionary()
+        # Samples a ring overwrote before a sync could persist them
+        self.lost = 0
+        self._compacted_day = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _last_time(self, machine):
+        # Newest persisted sample, so restarts and re-seeded windows never write duplicates
+        if machine not in self._last:
+            last = np.iinfo(np.int64).min
+            days = self.days(machine)
+            if days:
+                self._repair(machine, days[-1])
+                times = self._column(machine, days[-1], "Time")
+                if len(times):
+                    last = int(times[-1])
+            self._last[machine] = last
+        return self._last[machine]
+
+    def days(self, machine):
+        path = self.root / machine
+        return sorted(p.name for p in path.iterdir() if p.is_dir()) if path.exists() else []
+
+    def _column(self, machine, day, column):
+        # Whole items only: the sync thread may be halfway through writing one
+        name, dtype = RAW_FILES[column]
+        path = self.root / machine / day / name
+        count = path.stat().st_size // np.dtype(dtype).itemsize if path.exists() else 0
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def _columns(self, machine, day, columns=(TEMP, VIB)):
+        # The column files are appended one after another, so a reader (or a crash)
+        # can catch them at different lengths; rows past the shortest aren't complete
+        data = [self._column(machine, day, column) for column in ("Time",) + tuple(columns)]
+        n = min(len(d) for d in data)
+        return [d[:n] for d in data]
+
+    def _repair(self, machine, day):
+        # Cut a day interrupted mid-append back to its complete rows before writing more
+        n = len(self._columns(machine, day)[0])
+        for name, dtype in RAW_FILES.values():
+            path = self.root / machine / day / name
+            if path.exists() and path.stat().st_size > n * np.dtype(dtype).itemsize:
+                with open(path, "r+b") as f:
+                    f.truncate(n * np.dtype(dtype).itemsize)
+
+    def append(self, machine, times, temps, vibs):
+        times = np.asarray(times).astype("datetime64[ns]").astype(np.int64)
+        keep = times > self._last_time(machine)
+        if not keep.any():
+            return 0
+        times, temps, vibs = times[keep], np.asarray(temps)[keep], np.asarray(vibs)[keep]
+        day_index = times // DAY_NS
+        bounds = np.flatnonzero(np.r_[True, day_index[1:] != day_index[:-1], True])
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            folder = self.root / machine / _day(times[lo])
+            folder.mkdir(parents=True, exist_ok=True)
+            # Time goes last, so a row is only visible once all its columns are written
+            for column, values in ((TEMP, temps), (VIB, vibs), ("Time", times)):
+                name, dtype = RAW_FILES[column]
+                with open(folder / name, "ab") as f:
+                    f.write(np.ascontiguousarray(values[lo:hi], dtype=dtype).tobytes())
+        self._last[machine] = int(times[-1])
+        return len(times)
+
+    def append_samples(self, names, times, temps, vibs):
+        # Arbitrary (machine, sample) pairs, e.g. one ingestion batch, persisted
+        # straight from the feed so nothing depends on the ring buffers' size
+        names, times = np.asarray(names), np.asarray(times).astype("datetime64[ns]")
+        if not len(names):
+            return 0
+        order = np.lexsort((times, names))
+        names, times = names[order], times[order]
+        temps, vibs = np.asarray(temps)[order], np.asarray(vibs)[order]
+        bounds = np.flatnonzero(np.r_[True, names[1:] != names[:-1], True])
+        with self._lock:
+            return sum(self.append(str(names[lo]), times[lo:hi], temps[lo:hi], vibs[lo:hi])
+                       for lo, hi in zip(bounds[:-1], bounds[1:]))
+
+    def _sync_store(self, store):
+        with store.lock:
+            written = store.written.copy()
+            previous = self._synced.get(store, np.zeros_like(written))
+            fresh = np.where(written >= previous, written - previous, written)
+            self.lost += int(np.maximum(fresh - store.capacity, 0).sum())
+            fresh = np.minimum(fresh, store.capacity)
+            batches = [
+                (name, store.time_window(name, k).copy(), store.window(name, TEMP, k).copy(),
+                 store.window(name, VIB, k).copy())
+                for name, k in zip(store.machine_names, fresh) if k
+            ]
+        self._synced[store] = written
+        return sum(self.append(*batch) for batch in batches)
+
+    def sync(self, store=None):
+        # Persist whatever the followed ring buffers (or just `store`) received since
+        # their previous sync. Fleets of different sizes on one source share machine
+        # names; append() skips samples another fleet already persisted.
+        with self._lock:
+            saved = sum(self._sync_store(s) for s in ([store] if store is not None else list(self.stores)))
+            today = _day(time.time_ns())
+            if self._compacted_day != today:
+                self.compact(today)
+                self._compacted_day = today
+            return saved
+
+    def start_sync(self, store=None, interval=5.0):
+        # Idempotent: later calls add `store` to the followed ones, so sessions viewing
+        # different fleet sizes don't keep re-pointing the sync (released fleets drop out).
+        # Live feeds persist through append_samples and pass no store: the thread then
+        # only compacts finished days.
+        with self._lock:
+            if store is not None:
+                self.stores.add(store)
+            if self._thread is not None:
+                return self
+
+            def run():
+                self.sync()
+                while not self._stop.wait(interval):
+                    self.sync()
+            self._thread = threading.Thread(target=run, daemon=True, name="history-sync")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def compact(self, before_day):
+        # Write rollups for every finished day that doesn't have them yet
+        fleet = {}
+        for machine_dir in self.root.iterdir():
+            if not machine_dir.is_dir() or machine_dir.name.startswith("_"):
+                continue
+            for day in self.days(machine_dir.name):
+                folder = machine_dir / day
+                done = folder / "rollup_1d.npy"
+                if day >= before_day or (done.exists() and done.stat().st_mtime >= (folder / "time.i8").stat().st_mtime):
+                    continue
+                times, temps, vibs = self._columns(machine_dir.name, day)
+                for level, step in ROLLUP_LEVELS.items():
+                    records = aggregate(times, temps, vibs, step)
+                    np.save(folder / f"rollup_{level}.npy", records)
+                fleet.setdefault(day, []).append((machine_dir.name, records))
+        for day, rows in fleet.items():
+            (self.root / "_fleet").mkdir(exist_ok=True)
+            self._save_fleet_day(self.root / "_fleet" / f"{day}.npy", rows)
+
+    def _save_fleet_day(self, path, rows):
+        dtype = np.dtype([("Machine", "U64")] + ROLLUP_DTYPE.descr)
+        rows = [(machine, records) for machine, records in rows if len(records)]
+        existing = np.load(path) if path.exists() else np.zeros(0, dtype=dtype)
+        existing = existing[~np.isin(existing["Machine"], [machine for machine, _ in rows])]
+        out = np.zeros(len(rows), dtype=dtype)
+        for i, (machine, records) in enumerate(rows):
+            out[i]["Machine"] = machine
+            for field in ROLLUP_DTYPE.names:
+                out[i][field] = records[field][0]
+        np.save(path, np.concatenate([existing, out]))
+
+    def read(self, machine, start, end, columns=(TEMP, VIB)):
+        # Raw samples in [start, end); only the requested columns are paged in
+        lo_ns, hi_ns = _ns(start), _ns(end)
+        parts = {column: [] for column in ("Time",) + tuple(columns)}
+        for day in self.days(machine):
+            if day < _day(lo_ns) or day > _day(hi_ns):
+                continue
+            times, *values = self._columns(machine, day, columns)
+            lo, hi = np.searchsorted(times, [lo_ns, hi_ns])
+            if lo == hi:
+                continue
+            parts["Time"].append(np.asarray(times[lo:hi]))
+            for column, column_values in zip(columns, values):
+                parts[column].append(np.asarray(column_values[lo:hi], dtype=np.float64))
+        data = {c: np.concatenate(v) if v else np.zeros(0) for c, v in parts.items()}
+        index = pd.DatetimeIndex(data.pop("Time").astype("datetime64[ns]"), name="Time")
+        return pd.DataFrame(data, index=index)
+
+    def rollup(self, machine, start, end, level="1h"):
+        # Pre-aggregated min/max/mean; finished days come from their rollup file,
+        # the current day is aggregated from raw on the fly
+        lo_ns, hi_ns = _ns(start), _ns(end)
+        parts = []
+        for day in self.days(machine):
+            if day < _day(lo_ns) or day > _day(hi_ns):
+                continue
+            path = self.root / machine / day / f"rollup_{level}.npy"
+            if path.exists():
+                records = np.load(path, mmap_mode="r")
+            else:
+                records = aggregate(*self._columns(machine, day), ROLLUP_LEVELS[level])
+            lo, hi = np.searchsorted(records["Time"], [lo_ns // ROLLUP_LEVELS[level] * ROLLUP_LEVELS[level], hi_ns])
+            parts.append(np.asarray(records[lo:hi]))
+        return rollup_frame(np.concatenate(parts) if parts else np.zeros(0, dtype=ROLLUP_DTYPE))
+
+    def summary(self, machines, start_day, end_day):
+        # Fleet summary over whole days [start_day, end_day]; count-weighted means
+        # from the per-day fleet files, the current (uncompacted) day from raw
+        totals = {m: np.zeros(7) for m in machines}  # count, temp_sum, vib_sum, tmin, tmax, vmin, vmax
+        for acc in totals.values():
+            acc[3:] = (np.inf, -np.inf, np.inf, -np.inf)
+
+        def add(machine, r):
+            acc = totals[machine]
+            acc[0] += r["count"]
+            acc[1] += r["temp_mean"] * r["count"]
+            acc[2] += r["vib_mean"] * r["count"]
+            acc[3], acc[4] = min(acc[3], r["temp_min"]), max(acc[4], r["temp_max"])
+            acc[5], acc[6] = min(acc[5], r["vib_min"]), max(acc[6], r["vib_max"])
+
+        for day in pd.date_range(start_day, end_day, freq="D").strftime("%Y-%m-%d"):
+            path = self.root / "_fleet" / f"{day}.npy"
+            if path.exists():
+                for row in np.load(path):
+                    if row["Machine"] in totals and row["count"]:
+                        add(row["Machine"], row)
+                continue
+            for machine in machines:
+                records = aggregate(*self._columns(machine, day), DAY_NS)
+                if len(records):
+                    add(machine, records[0])
+        acc = np.array([totals[m] for m in machines]).reshape(len(machines), 7)
+        count = np.maximum(acc[:, 0], 1)
+        return pd.DataFrame({
+            "Machine": list(machines),
+            "Avg Temp": np.where(acc[:, 0] > 0, acc[:, 1] / count, np.nan),
+            "Avg Vib": np.where(acc[:, 0] > 0, acc[:, 2] / count, np.nan),
+            "Max Temp": np.where(acc[:, 0] > 0, acc[:, 4], np.nan),
+            "Max Vib": np.where(acc[:, 0] > 0, acc[:, 6], np.nan),
+            "Samples": acc[:, 0].astype(int),
+        })
@@ -0,0 +1,186 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from risk_engine import MODEL_PATH
+from sensor_store import TEMP, VIB
+
+FEATURE_WINDOW = 64
+FFT_BANDS = ((1, 5), (5, 12), (12, 33))
+FEATURE_NAMES = [
+    "temp_mean", "temp_std", "temp_min", "temp_max", "temp_last", "temp_recent", "temp_slope",
+    "vib_mean", "vib_std", "vib_max", "vib_last", "vib_recent", "vib_slope",
+    "vib_band_low", "vib_band_mid", "vib_band_high",
+]
+
+
+# ----- Feature extraction over (machines x window) matrices -----
+# Rolling stats and least-squares slopes per channel, plus the share of
+# vibration energy in three FFT bands (bearing wear shows up as energy moving
+# into the higher bands before the mean rises).
+def extract_features(temps, vibs, recent=10):
+    temps = np.asarray(temps, dtype=np.float64)
+    vibs = np.asarray(vibs, dtype=np.float64)
+    x = np.arange(temps.shape[1]) - (temps.shape[1] - 1) / 2
+    columns = []
+    for values in (temps, vibs):
+        mean = values.mean(axis=1)
+        slope = (values - mean[:, None]) @ x / (x @ x)
+        if values is temps:
+            columns += [mean, values.std(axis=1), values.min(axis=1), values.max(axis=1),
+                        values[:, -1], values[:, -recent:].mean(axis=1), slope]
+        else:
+            columns += [mean, values.std(axis=1), values.max(axis=1),
+                        values[:, -1], values[:, -recent:].mean(axis=1), slope]
+    power = np.abs(np.fft.rfft(vibs - vibs.mean(axis=1, keepdims=True), axis=1)) ** 2
+    total = np.maximum(power[:, 1:].sum(axis=1), 1e-12)
+    for lo, hi in FFT_BANDS:
+        columns.append(power[:, lo:hi].sum(axis=1) / total)
+    return np.column_stack(columns)
+
+
+# ----- Logistic-regression risk model (plain NumPy, stored as .npz) -----
+class RiskModel:
+    def __init__(self, weights, bias, mean, scale, window=FEATURE_WINDOW):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.window = int(window)
+
+    @classmethod
+    def fit(cls, features, labels, window=FEATURE_WINDOW, epochs=500, lr=0.5, l2=1e-3):
+        mean = features.mean(axis=0)
+        scale = np.where(features.std(axis=0) > 0, features.std(axis=0), 1.0)
+        z = (features - mean) / scale
+        weights, bias = np.zeros(z.shape[1]), 0.0
+        for _ in range(epochs):
+            p = 1 / (1 + np.exp(-(z @ weights + bias)))
+            error = p - labels
+            weights -= lr * (z.T @ error / len(z) + l2 * weights)
+            bias -= lr * error.mean()
+        return cls(weights, bias, mean, scale, window)
+
+    def predict_proba(self, features):
+        z = (features - self.mean) / self.scale
+        return 1 / (1 + np.exp(-np.clip(z @ self.weights + self.bias, -30, 30)))
+
+    def save(self, path, **metadata):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+                 window=self.window, features=np.array(FEATURE_NAMES), **metadata)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["weights"], data["bias"], data["mean"], data["scale"], data["window"])
+
+
+# ----- Worker-process side -----
+# Each worker keeps the model it last loaded and reloads it when a batch names a
+# newer version, so retraining never needs a new pool
+_worker_model = None
+_worker_version = None
+
+
+def score_windows(path, version, temps, vibs):
+    global _worker_model, _worker_version
+    if version != _worker_version:
+        _worker_model, _worker_version = RiskModel.load(path), version
+    return np.round(_worker_model.predict_proba(extract_features(temps, vibs)) * 100).astype(int)
+
+
+def make_pool(workers=2):
+    # fork, not spawn: Streamlit runs the page as __main__, so spawned workers
+    # would re-execute the whole dashboard while bootstrapping. Forking from the
+    # threaded server is only safe-ish, so it happens once: every worker is
+    # started here and the one pool is shared for the life of the process.
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("fork"))
+    for future in [pool.submit(int) for _ in range(workers)]:
+        future.result()
+    return pool
+
+
+# ----- Inference service: batched, asynchronous, cached per (machine, write version) -----
+# request() never blocks: it snapshots the windows of machines whose last sample
+# moved since they were last scored and hands them to the shared process pool
+# in batches. Finished batches land in the cache; scores() returns whatever is
+# cached (NaN where a machine has no score yet) for the page to read.
+class InferenceService:
+    def __init__(self, store, pool, model_path=MODEL_PATH, batch_size=1024):
+        self.store = store
+        self.pool = pool
+        self.model_path = str(model_path)
+        self.batch_size = batch_size
+        self.version = None
+        self.window = None
+        n = len(store.machine_names)
+        self._lock = threading.Lock()
+        self._scores = np.full(n, np.nan)
+        self._scored = np.full(n, -1, dtype=np.int64)
+        self._pending = []
+        self.error = None
+
+    def use_model(self, version):
+        # Idempotent; a new version (retrained file) drops every cached score
+        with self._lock:
+            if version != self.version:
+                self.window = int(RiskModel.load(self.model_path).window)
+                self.version = version
+                self._scores[:] = np.nan
+                self._scored[:] = -1
+                self.error = None
+        return self
+
+    def request(self):
+        with self._lock:
+            if self.version is None or any(not f.done() for f in self._pending):
+                return 0
+            self._pending = []
+            version, window = self.version, self.window
+        if self.store.capacity < window:
+            # Scoring a shorter window would silently feed the model other features
+            self.error = f"live window of {self.store.capacity} samples is shorter than the model's {window}"
+            return 0
+        with self.store.lock:
+            # A window is identified by its machine and write version (a repair's
+            # reset-and-refill changes the version even if the sample count doesn't)
+            versions = self.store.versions.copy()
+            todo = np.flatnonzero((versions != self._scored) & (self.store.written >= window))
+            if not todo.size:
+                return 0
+            temps, _ = self.store.matrix(TEMP, window, rows=todo)
+            vibs, _ = self.store.matrix(VIB, window, rows=todo)
+        for lo in range(0, todo.size, self.batch_size):
+            batch = slice(lo, lo + self.batch_size)
+            try:
+                future = self.pool.submit(score_windows, self.model_path, version, temps[batch], vibs[batch])
+            except BrokenProcessPool as e:
+                self.error = repr(e)
+                return 0
+            future.add_done_callback(lambda f, r=todo[batch], v=versions[todo][batch]: self._collect(f, r, v, version))
+            with self._lock:
+                self._pending.append(future)
+        return int(todo.size)
+
+    def _collect(self, future, rows, versions, version):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # Leave those machines unscored (the page falls back to the heuristic and says why)
+            self.error = repr(future.exception())
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._scores[rows] = future.result()
+            self._scored[rows] = versions
+            self.error = None
+
+    def scores(self):
+        with self._lock:
+            return self._scores.copy()
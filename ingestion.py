@@ -0,0 +1,275 @@
+import queue
+import select
+import socket
+import threading
+import time
+import weakref
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+# Feeds carry raw readings only, so the risk level is derived from the same
+# thresholds the alert messages use.
+def classify_risk(temps, vibs):
+    high = (temps > 85) | (vibs > 2.5)
+    medium = (temps > 77) | (vibs > 1.6)
+    return np.where(high, 2, np.where(medium, 1, 0)).astype(np.int8)
+
+
+# ----- Sources: yield raw CSV lines ("Machine,Time,Temperature (°F),Vibration (g)") -----
+# A source yields None whenever it has been idle for `poll` seconds so the reader
+# can flush partial batches and notice a stop request.
+class ReplaySource:
+    lossy = False
+
+    def __init__(self, path, speed=1.0, loop=False, poll=0.2):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.poll = poll
+
+    def lines(self, stop):
+        while not stop.is_set():
+            with open(self.path, encoding="utf-8") as f:
+                header = f.readline()
+                if not header.startswith("Machine"):
+                    f.seek(0)
+                start_feed = start_wall = None
+                for line in f:
+                    if stop.is_set():
+                        return
+                    if self.speed:
+                        # Pace the replay on the feed's own timestamps. A line without a
+                        # readable one goes straight through for the parser to count as
+                        # malformed; it must not end the feed.
+                        try:
+                            stamp = datetime.fromisoformat(line.split(",", 2)[1])
+                        except (IndexError, ValueError):
+                            yield line
+                            continue
+                        if start_feed is None:
+                            start_feed, start_wall = stamp, time.monotonic()
+                        ahead = (stamp - start_feed).total_seconds() / self.speed - (time.monotonic() - start_wall)
+                        if ahead > self.poll:
+                            yield None
+                            time.sleep(min(ahead, self.poll))
+                    yield line
+            if not self.loop:
+                return
+
+
+class SocketSource:
+    def __init__(self, host="127.0.0.1", port=9999, protocol="udp", poll=0.2):
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.poll = poll
+        # UDP senders can't be slowed down, so a full queue drops data instead
+        self.lossy = protocol == "udp"
+
+    def lines(self, stop):
+        # Checked here rather than on the page, so a bad Listen Address shows up as
+        # the worker's Error like a failed bind does
+        port = str(self.port)
+        if not port.isdigit() or int(port) > 65535:
+            raise ValueError(f"invalid listen port {port!r} (expected host:port)")
+        if self.protocol == "udp":
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, int(port)))
+        if self.protocol != "udp":
+            sock.listen()
+        conns, pending = [], {}
+        try:
+            while not stop.is_set():
+                ready, _, _ = select.select([sock] + conns, [], [], self.poll)
+                if not ready:
+                    yield None
+                for s in ready:
+                    if s is sock and self.protocol != "udp":
+                        conn, _ = sock.accept()
+                        conns.append(conn)
+                        pending[conn] = b""
+                        continue
+                    data = s.recv(65536)
+                    if s is sock:
+                        yield from data.decode("utf-8", "replace").splitlines()
+                        continue
+                    if not data:
+                        conns.remove(s)
+                        pending.pop(s)
+                        s.close()
+                        continue
+                    # TCP is a byte stream: keep the partial last line for the next read
+                    *complete, pending[s] = (pending[s] + data).split(b"\n")
+                    for line in complete:
+                        yield line.decode("utf-8", "replace")
+        finally:
+            for conn in conns:
+                conn.close()
+            sock.close()
+
+
+# ----- Background ingestion: reader thread -> bounded queue -> writer thread -----
+# The reader batches lines and blocks when the queue is full (backpressure on
+# replay files and TCP senders) or drops the oldest batch for UDP. The writer
+# drains every queued batch, parses them together and appends them to each
+# attached store in one pass, so the Streamlit rerun never parses anything: it
+# only reads the latest published snapshot. With a `history`, every batch is
+# also persisted as it arrives, however far it outruns the ring buffers.
+class IngestionWorker:
+    def __init__(self, store, source, history=None, batch_size=2000, flush_interval=0.25, max_batches=64):
+        # Weak, so a fleet released from the page cache stops being fed
+        self.stores = weakref.WeakSet([store])
+        self.source = source
+        self.history = history
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_batches)
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._stats = {"received": 0, "ingested": 0, "dropped": 0, "malformed": 0, "unknown": 0}
+        self._snapshot = {"Samples/s": 0.0, "Queue": 0, "Last Sample": None, "Error": None, **self._stats}
+
+    def start(self):
+        for target in (self._read, self._write):
+            thread = threading.Thread(target=target, daemon=True, name=f"ingest-{target.__name__[1:]}")
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def attach(self, store):
+        # The feed (and its socket) is shared by every fleet size viewing it, and
+        # each attached store gets all of its samples, so sessions never split it
+        with self._lock:
+            self.stores.add(store)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot
+
+    def _publish(self, **fields):
+        with self._lock:
+            self._snapshot = {**self._snapshot, **self._stats, "Queue": self.queue.qsize(), **fields}
+
+    def _put(self, batch):
+        self._stats["received"] += len(batch)
+        if self.source.lossy:
+            while True:
+                try:
+                    self.queue.put_nowait(batch)
+                    return
+                except queue.Full:
+                    try:
+                        self._stats["dropped"] += len(self.queue.get_nowait())
+                    except queue.Empty:
+                        pass
+        while not self._stop.is_set():
+            try:
+                self.queue.put(batch, timeout=self.flush_interval)
+                return
+            except queue.Full:
+                continue
+
+    def _read(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            for line in self.source.lines(self._stop):
+                if line:
+                    batch.append(line)
+                if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                    self._put(batch)
+                    batch = []
+                    deadline = time.monotonic() + self.flush_interval
+            if batch:
+                self._put(batch)
+        except (OSError, ValueError) as e:
+            self._publish(Error=str(e))
+
+    def _parse(self, lines, stores):
+        fields = [line.strip().split(",") for line in lines]
+        fields = [f for f in fields if len(f) == 4 and f[0] != "Machine"]
+        self._stats["malformed"] += len(lines) - len(fields)
+        known = [any(f[0] in store.index for store in stores) for f in fields]
+        self._stats["unknown"] += known.count(False)
+        fields = [f for f, ok in zip(fields, known) if ok]
+        try:
+            times = pd.to_datetime([f[1] for f in fields], format="ISO8601").values
+            temps = np.array([f[2] for f in fields], dtype=float)
+            vibs = np.array([f[3] for f in fields], dtype=float)
+        except ValueError:
+            # Fall back to line-by-line so one bad record doesn't cost the batch
+            good = []
+            for f in fields:
+                try:
+                    good.append((f[0], np.datetime64(f[1], "ns"), float(f[2]), float(f[3])))
+                except ValueError:
+                    self._stats["malformed"] += 1
+            if not good:
+                return None
+            names, times, temps, vibs = (np.array(col) for col in zip(*good))
+            return names, times.astype("datetime64[ns]"), temps, vibs
+        return np.array([f[0] for f in fields]), times, temps, vibs
+
+    @staticmethod
+    def _rows(store, names):
+        # Map machine names to this store's rows once per distinct name
+        unique, inverse = np.unique(names, return_inverse=True)
+        return np.array([store.index.get(name, -1) for name in unique], dtype=np.int64)[inverse]
+
+    def _write(self):
+        window_start, window_count = time.monotonic(), 0
+        while not self._stop.is_set():
+            try:
+                lines = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._publish(**{"Samples/s": 0.0})
+                continue
+            # Coalesce everything that piled up while we were busy
+            while True:
+                try:
+                    lines += self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            with self._lock:
+                stores = list(self.stores)
+            parsed = self._parse(lines, stores)
+            if parsed is None or not len(parsed[0]):
+                continue
+            names, times, temps, vibs = parsed
+            risk = classify_risk(temps, vibs)
+            for store in stores:
+                rows = self._rows(store, names)
+                mine = rows >= 0
+                store.append_samples(rows[mine], times[mine], temps[mine], vibs[mine], risk[mine])
+            if self.history is not None:
+                self.history.append_samples(names, times, temps, vibs)
+            self._stats["ingested"] += len(names)
+            window_count += len(names)
+            elapsed = time.monotonic() - window_start
+            if elapsed >= 1:
+                rate, window_start, window_count = window_count / elapsed, time.monotonic(), 0
+                self._publish(**{"Samples/s": round(rate, 1), "Last Sample": pd.Timestamp(times.max())})
+            else:
+                self._publish(**{"Last Sample": pd.Timestamp(times.max())})
+
+
+def make_source(kind, target):
+    if kind == "Replay File":
+        return ReplaySource(target)
+    host, _, port = str(target).rpartition(":")
+    return SocketSource(host or "127.0.0.1", port, protocol="tcp" if "TCP" in kind else "udp")
+
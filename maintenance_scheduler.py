@@ -0,0 +1,105 @@
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from alert_engine import alert_message
+from sensor_store import RISK_LEVELS, TEMP
+
+TECHNICIANS = ("Ali", "Maria", "Sohail")
+# Priority = predicted risk (0-100) plus a bonus for a live alert of that severity
+SEVERITY_BONUS = np.array([0, 10, 25])
+# Lead time by priority band: (minimum priority, hours until due)
+DUE_HOURS = ((90, 4), (70, 24), (0, 72))
+
+
+# ----- Background maintenance scheduler -----
+# Every `interval` seconds: read each viewed fleet's snapshot (risk scores) and
+# alert engine's per-machine severity, rank machines that crossed `threshold` or
+# carry a High alert, keep at most `max_per_cycle` of them (one argpartition,
+# so a cycle costs the same with 50 or 5000 at-risk machines) and hand them to
+# TicketStore.plan_repairs, which opens or escalates tickets in one transaction.
+class MaintenanceScheduler:
+    def __init__(self, tickets, technicians=TECHNICIANS, threshold=60, max_per_cycle=200, bus=None, metrics=None):
+        self.tickets = tickets
+        self.technicians = list(technicians)
+        self.threshold = threshold
+        self.max_per_cycle = max_per_cycle
+        self.bus = bus
+        self.metrics = metrics
+        # Every fleet being viewed; released fleets drop out
+        self.tickers = weakref.WeakSet()
+        self.last = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def candidates(self, names, scores, severity, temps, now):
+        priority = np.asarray(scores, dtype=np.int64) + SEVERITY_BONUS[severity]
+        due = np.select([priority >= p for p, _ in DUE_HOURS], [h for _, h in DUE_HOURS])
+        eligible = np.flatnonzero((scores >= self.threshold) | (severity == 2))
+        if eligible.size > self.max_per_cycle:
+            eligible = eligible[np.argpartition(-priority[eligible], self.max_per_cycle - 1)[:self.max_per_cycle]]
+        eligible = eligible[np.argsort(-priority[eligible], kind="stable")]
+        return [{
+            "Machine": names[i],
+            "Priority": int(priority[i]),
+            "Due": (now + pd.Timedelta(hours=int(due[i]))).strftime('%Y-%m-%d %H:%M'),
+            "Reason": alert_message(RISK_LEVELS[severity[i]], temps[i]) if severity[i]
+            else f"Predicted failure risk {int(scores[i])}%",
+        } for i in eligible]
+
+    def cycle(self):
+        started = time.perf_counter()
+        with self._lock:
+            tickers = list(self.tickers)
+        # Fleets of different sizes share machine names; each machine is planned
+        # once, at the highest priority any fleet gives it
+        planned = {}
+        for ticker in tickers:
+            snapshot = ticker.tick()
+            with ticker.store.lock:
+                severity = ticker.alert_engine.severity.copy()
+            for c in self.candidates(ticker.store.machine_names, snapshot["scores"], severity,
+                                     snapshot["latest"][TEMP], pd.Timestamp.now()):
+                if c["Machine"] not in planned or c["Priority"] > planned[c["Machine"]]["Priority"]:
+                    planned[c["Machine"]] = c
+        candidates = sorted(planned.values(), key=lambda c: -c["Priority"])[:self.max_per_cycle]
+        created, escalated = self.tickets.plan_repairs(candidates, self.technicians)
+        elapsed = time.perf_counter() - started
+        self.last = {"Time": time.strftime('%H:%M:%S'), "At Risk": len(candidates), "Created": created,
+                     "Escalated": escalated, "Cycle ms": round(elapsed * 1000, 1)}
+        if self.metrics is not None and self.metrics.enabled:
+            self.metrics.record("scheduler_cycle", elapsed)
+            self.metrics.count("tickets_auto_created", created)
+            self.metrics.count("tickets_escalated", escalated)
+        if self.bus is not None and (created or escalated):
+            self.bus.publish("tickets_planned", By="Scheduler", Created=created, Escalated=escalated)
+        return created, escalated
+
+    def start(self, ticker, interval=30.0):
+        # Idempotent like HistoryStore.start_sync: later calls add the current fleet
+        with self._lock:
+            self.tickers.add(ticker)
+            if self._thread is not None:
+                return self
+
+            def run():
+                while True:
+                    try:
+                        self.cycle()
+                        self.error = None
+                    except Exception as e:
+                        # Keep scheduling; the Maintenance view shows the last error
+                        self.error = repr(e)
+                    if self._stop.wait(interval):
+                        return
+            self._thread = threading.Thread(target=run, daemon=True, name="maintenance-scheduler")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,119 @@
+import contextlib
+import functools
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_DISABLED = contextlib.nullcontext()
+
+
+# ----- Stage timings and counters for the render path -----
+# One instance per server process. While disabled, stage() hands back a shared
+# no-op context and timed() wrappers cost one attribute check, so the hooks can
+# stay in the hot path permanently. While enabled, every stage keeps its last
+# `history` durations for percentiles plus running call counts and totals.
+class Metrics:
+    def __init__(self, enabled=False, history=500):
+        self.enabled = enabled
+        self.history = history
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._calls = {}
+        self._totals = {}
+        self._counters = {}
+
+    def record(self, name, seconds):
+        with self._lock:
+            if name not in self._durations:
+                self._durations[name] = deque(maxlen=self.history)
+                self._calls[name] = 0
+                self._totals[name] = 0.0
+            self._durations[name].append(seconds)
+            self._calls[name] += 1
+            self._totals[name] += seconds
+
+    @contextlib.contextmanager
+    def _timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def stage(self, name):
+        return self._timer(name) if self.enabled else _DISABLED
+
+    def timed(self, name):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self._timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._durations, self._calls, self._totals, self._counters = {}, {}, {}, {}
+
+    def _stats(self):
+        with self._lock:
+            stages = {name: np.array(d) for name, d in self._durations.items()}
+            return stages, dict(self._calls), dict(self._totals), dict(self._counters)
+
+    def summary(self):
+        stages, calls, totals, _ = self._stats()
+        return pd.DataFrame([{
+            "Stage": name,
+            "Calls": calls[name],
+            "Last ms": round(d[-1] * 1000, 2),
+            "p50 ms": round(float(np.percentile(d, 50)) * 1000, 2),
+            "p95 ms": round(float(np.percentile(d, 95)) * 1000, 2),
+            "Total s": round(totals[name], 3),
+        } for name, d in sorted(stages.items())], columns=["Stage", "Calls", "Last ms", "p50 ms", "p95 ms", "Total s"])
+
+    def counters(self):
+        return self._stats()[3]
+
+    def prometheus(self, prefix="pdm"):
+        # Text exposition format: one summary per stage, one counter per event
+        stages, calls, totals, counters = self._stats()
+        lines = [f"# HELP {prefix}_stage_seconds Dashboard stage latency.",
+                 f"# TYPE {prefix}_stage_seconds summary"]
+        for name, d in sorted(stages.items()):
+            for q in (0.5, 0.95):
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {np.quantile(d, q):.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {totals[name]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {calls[name]}')
+        lines += [f"# HELP {prefix}_events_total Dashboard event counters.",
+                  f"# TYPE {prefix}_events_total counter"]
+        for name, value in sorted(counters.items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        stages, calls, _, counters = self._stats()
+        return {
+            "time": str(pd.Timestamp.now()),
+            "stages_ms": {name: round(d[-1] * 1000, 3) for name, d in stages.items()},
+            "calls": calls,
+            "counters": counters,
+        }
+
+    def append_json(self, path):
+        # One line per call, so a log can be tailed or loaded with pd.read_json(lines=True)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
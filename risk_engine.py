@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import numpy as np
+
+from sensor_store import TEMP, VIB
+
+RISK_WINDOW = 10
+# Written by train_model.py; the dashboard only loads inference.py once it exists
+MODEL_PATH = Path(__file__).parent / "models" / "risk_model.npz"
+
+
+# ----- Batch failure-risk scoring -----
+# The dashboard's heuristic (60% temperature above 70°F, 40% vibration above
+# 1g, over the trailing window), for a whole (machines x samples) matrix in
+# one pass.
+def trailing_mean(matrix, valid=None, window=RISK_WINDOW):
+    recent = matrix[:, -window:]
+    if valid is None:
+        return recent.mean(axis=1)
+    valid = np.minimum(valid, recent.shape[1])
+    mask = np.arange(recent.shape[1]) >= recent.shape[1] - valid[:, None]
+    return np.where(mask, recent, 0).sum(axis=1) / np.maximum(valid, 1)
+
+
+def score_fleet(temp_matrix, vib_matrix, valid=None, window=RISK_WINDOW):
+    temp_risk = np.clip((trailing_mean(temp_matrix, valid, window) - 70) / 30, 0, 1)
+    vib_risk = np.clip((trailing_mean(vib_matrix, valid, window) - 1) / 2, 0, 1)
+    return ((0.6 * temp_risk + 0.4 * vib_risk) * 100).astype(int)
+
+
+# ----- Memoized scores, recomputed only when the store's data version moves -----
+class FleetRiskEngine:
+    def __init__(self, store, window=RISK_WINDOW):
+        self.store = store
+        self.window = window
+        self._version = None
+        self._scores = None
+
+    def scores(self):
+        with self.store.lock:
+            if self._version != self.store.version:
+                temps, valid = self.store.matrix(TEMP, self.window)
+                vibs, _ = self.store.matrix(VIB, self.window)
+                self._scores = score_fleet(temps, vibs, valid, self.window)
+                self._version = self.store.version
+            return self._scores
@@ -0,0 +1,153 @@
+import threading
+import numpy as np
+import pandas as pd
+
+TEMP = "Temperature (°F)"
+VIB = "Vibration (g)"
+CHANNELS = (TEMP, VIB)
+RISK_LEVELS = ("Low", "Medium", "High")
+
+
+# ----- Fleet-wide ring buffers (one row per machine, one array per channel) -----
+# Every sample is written twice, at slot and slot + capacity, so the trailing
+# window of any machine is always a single contiguous slice: reads are views,
+# never copies, and appends only touch the new samples.
+class SensorStore:
+    def __init__(self, machine_names, capacity):
+        n = len(machine_names)
+        self.machine_names = list(machine_names)
+        self.index = {name: i for i, name in enumerate(self.machine_names)}
+        self.capacity = capacity
+        self.times = np.zeros((n, 2 * capacity), dtype="datetime64[ns]")
+        self.values = {ch: np.zeros((n, 2 * capacity)) for ch in CHANNELS}
+        self.risk = np.zeros((n, 2 * capacity), dtype=np.int8)
+        self.written = np.zeros(n, dtype=np.int64)
+        # Bumped on every write to a machine, reset() included, so readers can tell a
+        # rebuilt window from an untouched one even when `written` comes out the same
+        self.versions = np.zeros(n, dtype=np.int64)
+        self.version = 0
+        self.lock = threading.RLock()
+
+    def _write(self, rows, slots, times, temps, vibs, risk):
+        for arr, data in ((self.times, times), (self.values[TEMP], temps),
+                          (self.values[VIB], vibs), (self.risk, risk)):
+            arr[rows, slots] = data
+            arr[rows, slots + self.capacity] = data
+
+    def append(self, name, times, temps, vibs, risk):
+        k = len(times)
+        if k == 0:
+            return
+        i = self.index[name]
+        keep = min(k, self.capacity)
+        start = self.written[i] + k - keep
+        slots = (start + np.arange(keep)) % self.capacity
+        with self.lock:
+            self._write(i, slots, np.asarray(times)[-keep:], np.asarray(temps)[-keep:],
+                        np.asarray(vibs)[-keep:], np.asarray(risk)[-keep:])
+            self.written[i] += k
+            self.versions[i] += 1
+            self.version += 1
+
+    def append_fleet(self, times, temps, vibs, risk):
+        # times: (k,) shared by all machines; temps/vibs/risk: (machines, k)
+        k = len(times)
+        if k == 0:
+            return
+        keep = min(k, self.capacity)
+        rows = np.arange(len(self.machine_names))[:, None]
+        start = self.written[:, None] + k - keep
+        slots = (start + np.arange(keep)) % self.capacity
+        with self.lock:
+            self._write(rows, slots, np.asarray(times)[-keep:], np.asarray(temps)[:, -keep:],
+                        np.asarray(vibs)[:, -keep:], np.asarray(risk)[:, -keep:])
+            self.written += k
+            self.versions += 1
+            self.version += 1
+
+    def append_samples(self, rows, times, temps, vibs, risk):
+        # Arbitrary (machine row, sample) pairs in arrival order, e.g. a batch from
+        # a live feed; grouped by machine and written in a single fancy-index pass.
+        rows = np.asarray(rows)
+        if rows.size == 0:
+            return
+        order = np.argsort(rows, kind="stable")
+        rows = rows[order]
+        counts = np.bincount(rows, minlength=len(self.machine_names))
+        rank = np.arange(rows.size) - (np.cumsum(counts) - counts)[rows]
+        keep = rank >= counts[rows] - self.capacity
+        order, rows, rank = order[keep], rows[keep], rank[keep]
+        with self.lock:
+            slots = (self.written[rows] + rank) % self.capacity
+            self._write(rows, slots, np.asarray(times)[order], np.asarray(temps)[order],
+                        np.asarray(vibs)[order], np.asarray(risk)[order])
+            self.written += counts
+            self.versions[counts > 0] += 1
+            self.version += 1
+
+    def reset(self, name):
+        with self.lock:
+            self.written[self.index[name]] = 0
+            self.versions[self.index[name]] += 1
+            self.version += 1
+
+    def size(self, name):
+        return int(min(self.written[self.index[name]], self.capacity))
+
+    def _span(self, i, n):
+        size = min(self.written[i], self.capacity)
+        n = size if n is None else min(n, size)
+        end = self.written[i] % self.capacity + self.capacity
+        return end - n, end
+
+    def window(self, name, channel, n=None):
+        # Zero-copy view of the last n samples; valid until the next append.
+        i = self.index[name]
+        lo, hi = self._span(i, n)
+        return self.values[channel][i, lo:hi]
+
+    def time_window(self, name, n=None):
+        i = self.index[name]
+        lo, hi = self._span(i, n)
+        return self.times[i, lo:hi]
+
+    def matrix(self, channel, n, rows=None):
+        # (machines x n) trailing window for the whole fleet (or just `rows`) plus
+        # a per-machine count of valid samples. A view when all machines are in
+        # lockstep. channel may also be "Risk" or "Time".
+        data = {"Risk": self.risk, "Time": self.times}.get(channel)
+        data = self.values[channel] if data is None else data
+        written = self.written if rows is None else self.written[rows]
+        n = min(n, self.capacity)
+        valid = np.minimum(written, n)
+        end = written % self.capacity + self.capacity
+        if rows is None and end.size and (end == end[0]).all():
+            return data[:, end[0] - n:end[0]], valid
+        cols = end[:, None] - n + np.arange(n)
+        source = data if rows is None else data[rows]
+        return np.take_along_axis(source, cols, axis=1), valid
+
+    def latest(self, name):
+        i = self.index[name]
+        _, hi = self._span(i, 1)
+        return {
+            "Time": pd.Timestamp(self.times[i, hi - 1]),
+            TEMP: float(self.values[TEMP][i, hi - 1]),
+            VIB: float(self.values[VIB][i, hi - 1]),
+            "Risk": RISK_LEVELS[self.risk[i, hi - 1]],
+        }
+
+    def latest_fleet(self, rows=None):
+        rows = np.arange(len(self.machine_names)) if rows is None else rows
+        last = self.written[rows] % self.capacity + self.capacity - 1
+        return {
+            TEMP: self.values[TEMP][rows, last],
+            VIB: self.values[VIB][rows, last],
+            "Risk": self.risk[rows, last],
+        }
+
+    def frame(self, name, n=None):
+        return pd.DataFrame(
+            {TEMP: self.window(name, TEMP, n), VIB: self.window(name, VIB, n)},
+            index=pd.DatetimeIndex(self.time_window(name, n), name="Time"),
+        )
@@ -0,0 +1,152 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from metrics import Metrics
+
+
+# ----- Process-wide event bus -----
+# Events are kept in a bounded, ordered log. A session subscribes by holding the
+# sequence number of the last event it saw and asking for everything after it,
+# so nothing has to be pushed into per-session copies.
+class EventBus:
+    def __init__(self, history=500):
+        self._events = deque(maxlen=history)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, topic, **payload):
+        with self._lock:
+            event = {"seq": next(self._seq), "topic": topic, "Time": time.strftime('%H:%M:%S'), **payload}
+            self._events.append(event)
+        return event
+
+    def last_seq(self):
+        with self._lock:
+            return self._events[-1]["seq"] if self._events else 0
+
+    def since(self, seq, topics=None):
+        with self._lock:
+            return [e for e in self._events if e["seq"] > seq and (topics is None or e["topic"] in topics)]
+
+
+# ----- Shared operator/maintenance/supervisor state -----
+# One instance per server process: an operator's acknowledgement is visible to
+# the maintenance user in any other browser on their next rerun. Every change is
+# also published on the bus so sessions can react to what others did. Ticket
+# approvals live in the TicketStore; only their events go through here.
+class SharedState:
+    def __init__(self, bus=None):
+        self.bus = bus or EventBus()
+        self._lock = threading.Lock()
+        self.ack_log = {}
+        self.attn_from_operator = set()
+        self.scheduled_repairs = set()
+        self.repaired_machines = set()
+
+    def acknowledge(self, machine, role):
+        with self._lock:
+            if machine in self.ack_log:
+                return False
+            self.ack_log[machine] = role
+            self.attn_from_operator.add(machine)
+        self.bus.publish("ack", Machine=machine, By=role)
+        return True
+
+    def request_attention(self, machine, role):
+        with self._lock:
+            self.attn_from_operator.add(machine)
+        self.bus.publish("attention", Machine=machine, By=role)
+
+    def clear_attention(self, machine, role):
+        with self._lock:
+            self.attn_from_operator.discard(machine)
+        self.bus.publish("attention_cleared", Machine=machine, By=role)
+
+    def schedule_repair(self, machine, role):
+        with self._lock:
+            if machine in self.scheduled_repairs:
+                return False
+            self.scheduled_repairs.add(machine)
+        self.bus.publish("scheduled", Machine=machine, By=role)
+        return True
+
+    def mark_repaired(self, machine, role):
+        with self._lock:
+            self.repaired_machines.add(machine)
+            self.scheduled_repairs.discard(machine)
+            self.attn_from_operator.discard(machine)
+            self.ack_log.pop(machine, None)
+        self.bus.publish("repaired", Machine=machine, By=role)
+
+    def approve(self, ticket, role):
+        self.bus.publish("approved", Ticket=ticket, By=role)
+
+    def snapshot(self):
+        # Copies, so a page can iterate while other sessions keep writing
+        with self._lock:
+            return {
+                "ack_log": dict(self.ack_log),
+                "attn_from_operator": sorted(self.attn_from_operator),
+                "scheduled_repairs": set(self.scheduled_repairs),
+                "repaired_machines": set(self.repaired_machines),
+            }
+
+
+# ----- One fleet update per tick, shared by every viewer -----
+# The first session to rerun after `interval` seconds advances the simulator,
+# folds new samples into the trend buckets, rescores and updates alerts; every
+# other session in that window just reads the resulting snapshot.
+class FleetTicker:
+    def __init__(self, store, risk_engine, alert_engine, trends, simulator=None, inference=None, interval=1.0,
+                 metrics=None):
+        self.store = store
+        self.risk_engine = risk_engine
+        self.alert_engine = alert_engine
+        self.trends = trends
+        self.simulator = simulator
+        self.inference = inference
+        self.interval = interval
+        self.metrics = metrics or Metrics()
+        self._lock = threading.Lock()
+        self._last = -np.inf
+        self._snapshot = None
+        self.ticks = 0
+
+    def tick(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if self._snapshot is not None and not force and now - self._last < self.interval:
+                return self._snapshot
+            metrics = self.metrics
+            if self.simulator is not None:
+                with metrics.stage("tick.simulate"):
+                    metrics.count("samples_simulated", self.simulator.tick(pd.Timestamp.now()) * len(self.store.machine_names))
+            with metrics.stage("tick.trends"):
+                self.trends.update()
+            with metrics.stage("tick.score"):
+                scores = self.risk_engine.scores()
+                learned = None
+                if self.inference is not None:
+                    self.inference.request()
+                    learned = self.inference.scores()
+                    scores = np.where(np.isnan(learned), scores, learned).astype(int)
+            with metrics.stage("tick.alerts"):
+                metrics.count("alert_events", len(self.alert_engine.update()))
+            self._snapshot = {
+                "latest": self.store.latest_fleet(),
+                "scores": scores,
+                "learned": learned,
+                "alerts": self.alert_engine.active(),
+                "active": self.alert_engine.active_count(),
+                "high": self.alert_engine.counts["High"],
+                "events": list(self.alert_engine.events),
+            }
+            self._last = now
+            self.ticks += 1
+            metrics.count("fleet_ticks")
+            return self._snapshot
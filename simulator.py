@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# ----- Demo sensor profiles -----
+# "degrading" ramps up over the first ramp_samples readings and then holds at the
+# worn level, "drifting" creeps up a few degrees, "repaired"/"normal" stay flat.
+PROFILES = ("normal", "drifting", "degrading", "repaired")
+
+
+def simulate_machine_profile(profile, steps, rng, ramp_samples=120):
+    # steps may be 1-D (one machine) or (machines x samples) for a whole profile group
+    shape = np.shape(steps)
+    ramp = np.minimum(steps, ramp_samples - 1) / max(ramp_samples - 1, 1)
+    if profile == "repaired":
+        temp = 68 + rng.normal(0, 0.7, shape)
+        vib = 1.0 + rng.normal(0, 0.1, shape)
+        risk = np.zeros(shape, dtype=np.int8)
+    elif profile == "degrading":
+        temp = 75 + 20 * ramp + rng.normal(0, 2, shape)
+        vib = 1.4 + 2 * ramp + rng.normal(0, 0.18, shape)
+        risk = np.full(shape, 2, dtype=np.int8)
+    elif profile == "drifting":
+        temp = 72 + 6 * ramp + rng.normal(0, 1.1, shape)
+        vib = 1.1 + rng.normal(0, 0.14, shape)
+        risk = (temp > 77).astype(np.int8)
+    else:
+        temp = 68 + rng.normal(0, 1, shape)
+        vib = 1.0 + rng.normal(0, 0.09, shape)
+        risk = np.zeros(shape, dtype=np.int8)
+    return temp, vib, risk
+
+
+# ----- Ticks the shared SensorStore forward in wall-clock time -----
+# Only the samples that became due since the last tick are generated, so the
+# cost of a rerun depends on elapsed time, not on history length.
+class FleetSimulator:
+    def __init__(self, store, profiles, period=pd.Timedelta(minutes=1), seed=None):
+        self.store = store
+        self.profiles = dict(profiles)
+        self.period = np.timedelta64(period.value, "ns")
+        self.rng = np.random.default_rng(seed)
+        self.last_time = None
+
+    def _generate(self, names, steps):
+        # One vectorized draw per profile group rather than one per machine
+        temps = np.empty((len(names), len(steps)))
+        vibs = np.empty_like(temps)
+        risk = np.empty(temps.shape, dtype=np.int8)
+        groups = {}
+        for i, name in enumerate(names):
+            groups.setdefault(self.profiles.get(name, "normal"), []).append(i)
+        for profile, rows in groups.items():
+            written = self.store.written[[self.store.index[names[i]] for i in rows]]
+            temps[rows], vibs[rows], risk[rows] = simulate_machine_profile(
+                profile, written[:, None] + steps, self.rng, self.store.capacity)
+        return temps, vibs, risk
+
+    def seed_history(self, now):
+        end = np.datetime64(pd.Timestamp(now).floor("s"), "ns")
+        n = self.store.capacity
+        times = end - self.period * np.arange(n - 1, -1, -1)
+        self.store.append_fleet(times, *self._generate(self.store.machine_names, np.arange(n)))
+        self.last_time = end
+
+    def tick(self, now):
+        now = np.datetime64(pd.Timestamp(now), "ns")
+        with self.store.lock:
+            if self.last_time is None:
+                self.seed_history(now)
+                return self.store.capacity
+            due = int((now - self.last_time) // self.period)
+            if due <= 0:
+                return 0
+            keep = min(due, self.store.capacity)
+            times = self.last_time + self.period * np.arange(due - keep + 1, due + 1)
+            self.store.append_fleet(times, *self._generate(self.store.machine_names, np.arange(keep)))
+            self.last_time = self.last_time + self.period * due
+            return keep
+
+    def repair(self, name, now):
+        # Swap in the healthy profile and rebuild that machine's window from scratch
+        with self.store.lock:
+            self.profiles[name] = "repaired"
+            self.store.reset(name)
+            n = self.store.capacity
+            end = self.last_time if self.last_time is not None else np.datetime64(pd.Timestamp(now), "ns")
+            times = end - self.period * np.arange(n - 1, -1, -1)
+            self.store.append(name, times, *simulate_machine_profile("repaired", np.arange(n), self.rng))
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The dashboard modules live flat in the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from alert_engine import AlertEngine
+from fleet import FleetRegistry
+from sensor_store import SensorStore
+from simulator import FleetSimulator
+
+NOW = pd.Timestamp("2025-06-03 12:00")
+
+
+def push(store, name, risk, temp=70.0):
+    n = len(risk)
+    start = store.written[store.index[name]]
+    times = (NOW + pd.to_timedelta(start + np.arange(n), unit="min")).values
+    store.append(name, times, np.full(n, temp), np.full(n, 0.5), np.asarray(risk, dtype=np.int8))
+
+
+def test_raise_is_debounced_and_clear_has_hysteresis():
+    store = SensorStore(["Pump-03"], 20)
+    engine = AlertEngine(store, raise_after=2, clear_after=3)
+    push(store, "Pump-03", [0, 2])
+    assert engine.update() == []
+    push(store, "Pump-03", [2], temp=90.0)
+    events = engine.update()
+    assert [(e["Event"], e["To"]) for e in events] == [("raise", "High")]
+    assert engine.active()[0]["Alert"] == "Bearing temp high"
+    push(store, "Pump-03", [0, 0])
+    assert engine.update() == []
+    push(store, "Pump-03", [0])
+    assert [e["Event"] for e in engine.update()] == ["clear"]
+    assert engine.active_count() == 0
+
+
+def test_unchanged_machines_are_skipped():
+    store = SensorStore(["Mixer-01", "Pump-03"], 20)
+    engine = AlertEngine(store)
+    push(store, "Pump-03", [2, 2])
+    engine.update()
+    assert engine.update() == []
+    assert engine.counts == {"High": 1, "Medium": 0}
+
+
+def test_reset_window_of_same_length_is_re_evaluated():
+    # reset + refill to the same sample count must still count as new data
+    store = SensorStore(["Pump-03"], 5)
+    engine = AlertEngine(store)
+    push(store, "Pump-03", [2] * 5)
+    engine.update()
+    store.reset("Pump-03")
+    push(store, "Pump-03", [0] * 5)
+    assert store.written[0] == 5
+    assert [e["Event"] for e in engine.update()] == ["clear"]
+    assert engine.counts["High"] == 0
+
+
+def test_repair_before_first_tick_clears_alert():
+    registry = FleetRegistry(3)
+    store = SensorStore(registry.names, 30)
+    simulator = FleetSimulator(store, registry.profiles, seed=0)
+    simulator.tick(NOW)
+    engine = AlertEngine(store)
+    engine.update()
+    assert "Pump-03" in [a["Machine"] for a in engine.active()]
+    simulator.repair("Pump-03", NOW)
+    engine.update()
+    assert "Pump-03" not in [a["Machine"] for a in engine.active()]
+    assert engine.counts["High"] == 0
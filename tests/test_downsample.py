@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from downsample import TREND_SPANS, TrendIndex
+from sensor_store import SensorStore, TEMP, VIB
+
+NOW = pd.Timestamp("2025-06-03 12:00")
+
+
+def fill(store, name, minutes, temps):
+    times = NOW - pd.to_timedelta(np.arange(minutes)[::-1], unit="min")
+    store.append(name, times.values, temps, np.full(minutes, 0.5), np.zeros(minutes, dtype=np.int8))
+
+
+def test_frame_keeps_bucket_extremes():
+    store = SensorStore(["Pump-03"], 240)
+    temps = np.full(120, 70.0)
+    temps[-30] = 90.0
+    fill(store, "Pump-03", 120, temps)
+    index = TrendIndex(store)
+    assert index.update() == 120
+    frame = index.frame("Pump-03", "2 hours", NOW)
+    assert len(frame) <= 2 * (index.budget + 1)
+    assert frame[TEMP].max() == 90.0
+    assert frame[TEMP].min() == 70.0
+
+
+def test_batch_spanning_ring_does_not_leak_old_buckets():
+    # 22 hours of 1-minute samples in one batch wrap the 2-hour ring many times;
+    # a spike from 22 h ago must not end up in a bucket of the last 2 hours
+    minutes = 22 * 60
+    store = SensorStore(["Pump-03"], minutes)
+    temps = np.full(minutes, 70.0)
+    temps[0] = 200.0
+    fill(store, "Pump-03", minutes, temps)
+    index = TrendIndex(store)
+    index.update()
+    assert index.frame("Pump-03", "2 hours", NOW)[TEMP].max() == 70.0
+    assert index.frame("Pump-03", "24 hours", NOW)[TEMP].max() == 200.0
+
+
+def test_incremental_updates_match_one_batch():
+    store = SensorStore(["Mixer-01"], 600)
+    rng = np.random.default_rng(0)
+    temps = 70 + rng.normal(0, 3, 600)
+    fill(store, "Mixer-01", 600, temps)
+    whole = TrendIndex(store)
+    whole.update()
+
+    parts = SensorStore(["Mixer-01"], 600)
+    index = TrendIndex(parts)
+    times = NOW - pd.to_timedelta(np.arange(600)[::-1], unit="min")
+    for lo in range(0, 600, 50):
+        parts.append("Mixer-01", times.values[lo:lo + 50], temps[lo:lo + 50], np.full(50, 0.5), np.zeros(50, dtype=np.int8))
+        index.update()
+    pd.testing.assert_frame_equal(whole.frame("Mixer-01", "2 hours", NOW), index.frame("Mixer-01", "2 hours", NOW))
+    assert np.isclose(index.frame("Mixer-01", "24 hours", NOW)[VIB], 0.5).all()
+
+
+def test_reset_window_of_same_length_is_refolded():
+    store = SensorStore(["Pump-03"], 60)
+    index = TrendIndex(store)
+    fill(store, "Pump-03", 60, np.full(60, 95.0))
+    index.update()
+    store.reset("Pump-03")
+    fill(store, "Pump-03", 60, np.full(60, 65.0))
+    assert index.update() == 60
+    # The degraded peaks are gone from every zoom level, not merged with the refill
+    for label in TREND_SPANS:
+        frame = index.frame("Pump-03", label, NOW)
+        assert frame[TEMP].min() == 65.0
+        assert frame[TEMP].max() == 65.0
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from environment import ENV_TEMP, EnvironmentMonitor
+
+NOW = pd.Timestamp("2025-06-03 12:00")
+BASE = np.array([70.0, 47.0, 500.0])
+
+
+def feed(monitor, k, temp_offset=0.0, co2=None):
+    # k samples around BASE with a small alternating wobble, so the rolling std isn't 0
+    samples = np.repeat(BASE[:, None, None], k, axis=2) + 0.1 * (-1) ** np.arange(k)
+    samples[0, :, -1] += temp_offset
+    if co2 is not None:
+        samples[2, :, -1] = co2
+    start = monitor.written
+    times = (NOW + pd.to_timedelta(start + np.arange(k), unit="s")).values
+    monitor.append(times, samples)
+    return monitor.summary().iloc[0]
+
+
+def test_spike_after_warm_up_is_flagged():
+    monitor = EnvironmentMonitor(["Zone-01"], window=10, seed=0)
+    assert feed(monitor, 20)["Status"] == "OK"
+    # 5°F is still inside the safe range, so only the statistics can catch it
+    row = feed(monitor, 1, temp_offset=5.0)
+    assert row["Status"] == "Anomaly"
+    assert row["Flagged"] == "Temperature"
+    assert row["Anomalies"] == 1
+    assert monitor.zscore[0, 0] > monitor.z_threshold
+
+
+def test_no_statistical_flags_during_warm_up():
+    monitor = EnvironmentMonitor(["Zone-01"], window=10, seed=0)
+    feed(monitor, 5)
+    row = feed(monitor, 1, temp_offset=5.0)
+    assert row["Status"] == "OK"
+    assert row["Anomalies"] == 0
+
+
+def test_out_of_range_is_flagged_even_while_warming_up():
+    monitor = EnvironmentMonitor(["Zone-01"], window=10, seed=0)
+    row = feed(monitor, 3, co2=700.0)
+    assert row["Status"] == "Out of range"
+    assert row["Air"] == "Alert"
+    assert row["Flagged"] == "CO2"
+
+
+def test_tick_is_idempotent_per_period():
+    monitor = EnvironmentMonitor(["Zone-01", "Zone-02"], window=10, period=pd.Timedelta(seconds=10), seed=0)
+    # The first tick back-fills one window so the statistics can start right away
+    assert monitor.tick(NOW) == 10
+    assert monitor.tick(NOW) == 0
+    assert monitor.tick(NOW + pd.Timedelta(seconds=9)) == 0
+    assert monitor.tick(NOW + pd.Timedelta(seconds=25)) == 2
+    assert monitor.written == 12
+    assert list(monitor.summary()["Zone"]) == ["Zone-01", "Zone-02"]
+    assert monitor.summary()[ENV_TEMP].between(60, 95).all()
+
+
+def test_step_is_flagged_then_absorbed():
+    monitor = EnvironmentMonitor(["Zone-01"], window=10, seed=0)
+    feed(monitor, 20)
+    stepped = np.repeat(BASE[:, None, None], 60, axis=2) + 0.1 * (-1) ** np.arange(60)
+    stepped[0] += 3.0
+    times = (NOW + pd.to_timedelta(20 + np.arange(60), unit="s")).values
+    monitor.append(times[:1], stepped[:, :, :1])
+    assert monitor.summary().iloc[0]["Status"] == "Anomaly"
+    # Once the rolling window and the EWMA have moved to the new level it is normal again
+    monitor.append(times[1:], stepped[:, :, 1:])
+    assert monitor.summary().iloc[0]["Status"] == "OK"
+    assert abs(monitor.ewma[0, 0] - 73.0) < 0.2
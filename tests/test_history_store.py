@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from history_store import HistoryStore, aggregate
+from sensor_store import TEMP, VIB, SensorStore
+
+DAY = pd.Timestamp("2025-06-03")
+
+
+def minutes(n, start=DAY):
+    return (start + pd.to_timedelta(np.arange(n), unit="min")).values.astype("datetime64[ns]")
+
+
+def write(history, n=10, start=DAY):
+    temps = 70 + np.arange(n, dtype=float)
+    return history.append("Pump-03", minutes(n, start), temps, np.full(n, 0.5))
+
+
+def test_read_and_rollup_round_trip(tmp_path):
+    history = HistoryStore(tmp_path)
+    assert write(history, 120) == 120
+    frame = history.read("Pump-03", DAY, DAY + pd.Timedelta(hours=1))
+    assert len(frame) == 60
+    assert frame[TEMP].iloc[-1] == 129.0
+    hourly = history.rollup("Pump-03", DAY, DAY + pd.Timedelta(hours=2), "1h")
+    assert list(hourly["count"]) == [60, 60]
+    assert hourly["temp_max"].iloc[1] == 189.0
+
+
+def test_append_skips_already_persisted_samples(tmp_path):
+    history = HistoryStore(tmp_path)
+    write(history, 10)
+    assert HistoryStore(tmp_path).append("Pump-03", minutes(12), np.full(12, 70.0), np.full(12, 0.5)) == 2
+
+
+def test_reads_tolerate_a_half_written_row(tmp_path):
+    # Time column one row (plus a partial item) ahead of the value columns, as a
+    # reader sees it mid-append or as a crash leaves it
+    history = HistoryStore(tmp_path)
+    write(history, 10)
+    folder = tmp_path / "Pump-03" / "2025-06-03"
+    with open(folder / "time.i8", "ab") as f:
+        f.write(np.int64(minutes(11)[-1].astype(np.int64)).tobytes() + b"\x00\x01")
+    with open(folder / "temp.f4", "ab") as f:
+        f.write(b"\x00")
+
+    frame = history.read("Pump-03", DAY, DAY + pd.Timedelta(hours=1))
+    assert len(frame) == 10
+    assert len(history.rollup("Pump-03", DAY, DAY + pd.Timedelta(hours=1), "1min")) == 10
+    assert history.summary(["Pump-03"], DAY, DAY)["Samples"].item() == 10
+
+
+def test_restart_repairs_interrupted_append(tmp_path):
+    write(HistoryStore(tmp_path), 10)
+    folder = tmp_path / "Pump-03" / "2025-06-03"
+    with open(folder / "time.i8", "ab") as f:
+        f.write(np.int64(minutes(11)[-1].astype(np.int64)).tobytes())
+
+    history = HistoryStore(tmp_path)
+    # The lost row is written again and every column stays aligned
+    assert write(history, 12) == 2
+    frame = history.read("Pump-03", DAY, DAY + pd.Timedelta(hours=1))
+    assert len(frame) == 12
+    assert list(frame[TEMP]) == list(70 + np.arange(12, dtype=float))
+    assert (folder / "time.i8").stat().st_size == 12 * 8
+
+
+def test_aggregate_buckets():
+    times = minutes(4).astype(np.int64)
+    out = aggregate(times, [1.0, 3.0, 5.0, 7.0], [0.1, 0.2, 0.3, 0.4], 2 * 60 * 10**9)
+    assert list(out["count"]) == [2, 2]
+    assert list(out["temp_mean"]) == [2.0, 6.0]
+    assert np.allclose(out["vib_max"], [0.2, 0.4])
+
+
+
+def test_sync_follows_every_fleet_without_duplicates(tmp_path):
+    history = HistoryStore(tmp_path)
+    small, large = SensorStore(["Mixer-01"], 10), SensorStore(["Mixer-01", "Pump-03"], 10)
+    for store in (small, large):
+        n = len(store.machine_names)
+        store.append_fleet(minutes(3), np.full((n, 3), 70.0), np.full((n, 3), 0.5), np.zeros((n, 3), np.int8))
+    history.stores.add(small)
+    history.stores.add(large)
+    # Mixer-01 is in both fleets but only persisted once
+    assert history.sync() == 6
+    assert history.sync() == 0
+    assert len(history.read("Mixer-01", DAY, DAY + pd.Timedelta(hours=1))) == 3
+
+
+def test_append_samples_groups_interleaved_machines(tmp_path):
+    history = HistoryStore(tmp_path)
+    times = minutes(4)
+    saved = history.append_samples(["Pump-03", "Mixer-01", "Pump-03", "Mixer-01"], times[[1, 0, 0, 1]],
+                                   [71.0, 60.0, 70.0, 61.0], [0.5, 0.4, 0.5, 0.4])
+    assert saved == 4
+    assert history.read("Pump-03", DAY, DAY + pd.Timedelta(hours=1))[TEMP].tolist() == [70.0, 71.0]
+    assert history.read("Mixer-01", DAY, DAY + pd.Timedelta(hours=1))[TEMP].tolist() == [60.0, 61.0]
+
+
+def test_sync_counts_samples_the_ring_overwrote(tmp_path):
+    history = HistoryStore(tmp_path)
+    store = SensorStore(["Pump-03"], 5)
+    store.append("Pump-03", minutes(8), np.full(8, 70.0), np.full(8, 0.5), np.zeros(8, np.int8))
+    assert history.sync(store) == 5
+    assert history.lost == 3
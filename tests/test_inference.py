@@ -0,0 +1,85 @@
+import time
+
+import numpy as np
+import pytest
+
+from inference import FEATURE_NAMES, InferenceService, RiskModel, extract_features, make_pool
+from sensor_store import SensorStore
+
+WINDOW = 8
+
+
+def constant_model(path, bias, window=WINDOW):
+    # Zero weights: every window scores sigmoid(bias)
+    n = len(FEATURE_NAMES)
+    RiskModel(np.zeros(n), bias, np.zeros(n), np.ones(n), window).save(path)
+
+
+def filled_store(capacity=16, samples=12):
+    store = SensorStore(["Mixer-01", "Pump-03"], capacity)
+    times = np.arange(samples).astype("datetime64[m]").astype("datetime64[ns]")
+    temps = np.tile(70 + np.arange(samples, dtype=float), (2, 1))
+    store.append_fleet(times, temps, np.full((2, samples), 0.5), np.zeros((2, samples), dtype=np.int8))
+    return store
+
+
+def wait_scores(service, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        service.request()
+        scores = service.scores()
+        if not np.isnan(scores).any():
+            return scores
+        assert time.monotonic() < deadline, service.error
+        time.sleep(0.02)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = make_pool(workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_extract_features_shape():
+    rng = np.random.default_rng(0)
+    features = extract_features(70 + rng.normal(size=(3, 64)), rng.normal(size=(3, 64)))
+    assert features.shape == (3, len(FEATURE_NAMES))
+    assert np.isfinite(features).all()
+
+
+def test_model_round_trip(tmp_path):
+    constant_model(tmp_path / "m.npz", 0.0)
+    model = RiskModel.load(tmp_path / "m.npz")
+    assert model.window == WINDOW
+    assert np.allclose(model.predict_proba(np.zeros((2, len(FEATURE_NAMES)))), 0.5)
+
+
+def test_no_model_scores_nothing(pool):
+    service = InferenceService(filled_store(), pool)
+    assert service.request() == 0
+    assert np.isnan(service.scores()).all()
+
+
+def test_retrained_model_is_reloaded_by_the_same_pool(tmp_path, pool):
+    path = tmp_path / "m.npz"
+    constant_model(path, 0.0)
+    service = InferenceService(filled_store(), pool, path).use_model(1)
+    assert list(wait_scores(service)) == [50, 50]
+    # Same version again is a no-op: cached scores stay
+    assert service.use_model(1).request() == 0
+
+    constant_model(path, 10.0)
+    service.use_model(2)
+    assert np.isnan(service.scores()).all()
+    assert list(wait_scores(service)) == [100, 100]
+    assert service.error is None
+
+
+def test_window_longer_than_store_is_rejected(tmp_path, pool):
+    path = tmp_path / "m.npz"
+    constant_model(path, 0.0, window=64)
+    service = InferenceService(filled_store(capacity=30, samples=30), pool, path).use_model(1)
+    assert service.request() == 0
+    assert "shorter than the model's 64" in service.error
+    assert np.isnan(service.scores()).all()
@@ -0,0 +1,113 @@
+import queue
+import time
+
+import numpy as np
+
+from history_store import HistoryStore
+from ingestion import IngestionWorker, ReplaySource, classify_risk, make_source
+from sensor_store import SensorStore
+
+
+class QueueSource:
+    lossy = False
+
+    def __init__(self):
+        self.pending = queue.Queue()
+
+    def lines(self, stop):
+        while not stop.is_set():
+            try:
+                yield self.pending.get(timeout=0.02)
+            except queue.Empty:
+                yield None
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_classify_risk():
+    assert list(classify_risk(np.array([70.0, 80.0, 90.0]), np.array([0.5, 0.5, 0.5]))) == [0, 1, 2]
+
+
+def test_replay_file_is_ingested(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text("Machine,Time,Temperature (°F),Vibration (g)\n"
+                    "Pump-03,2025-06-03T12:00:00,71.5,0.8\n"
+                    "Pump-03,2025-06-03T12:01:00,88.0,0.9\n"
+                    "Nope-99,2025-06-03T12:01:00,70.0,0.5\n"
+                    "garbage\n", encoding="utf-8")
+    store = SensorStore(["Pump-03"], 10)
+    worker = IngestionWorker(store, ReplaySource(path, speed=0), flush_interval=0.05).start()
+    try:
+        wait_for(lambda: worker.snapshot()["ingested"] == 2)
+    finally:
+        worker.stop()
+    assert store.latest("Pump-03")["Risk"] == "High"
+    assert worker.snapshot()["unknown"] == 1
+    assert worker.snapshot()["malformed"] == 1
+
+
+def test_paced_replay_skips_bad_timestamps(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text("Pump-03,2025-06-03T12:00:00.000,71.5,0.8\n"
+                    "Pump-03,garbage,72.0,0.8\n"
+                    "no fields at all\n"
+                    "Pump-03,2025-06-03T12:00:00.010,72.5,0.8\n", encoding="utf-8")
+    store = SensorStore(["Pump-03"], 10)
+    worker = IngestionWorker(store, ReplaySource(path), flush_interval=0.05).start()
+    try:
+        wait_for(lambda: worker.snapshot()["malformed"] == 2 and worker.snapshot()["ingested"] == 2)
+    finally:
+        worker.stop()
+    assert store.written[0] == 2
+    assert worker.snapshot()["Error"] is None
+
+
+def test_worker_persists_batches_beyond_ring_size(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text("".join(f"Pump-03,2025-06-03T12:{i:02d}:00,70.0,0.5\n" for i in range(12)), encoding="utf-8")
+    store = SensorStore(["Pump-03"], 4)
+    history = HistoryStore(tmp_path / "history")
+    worker = IngestionWorker(store, ReplaySource(path, speed=0), history=history, flush_interval=0.05).start()
+    try:
+        wait_for(lambda: worker.snapshot()["ingested"] == 12)
+    finally:
+        worker.stop()
+    assert store.size("Pump-03") == 4
+    assert len(history.read("Pump-03", "2025-06-03", "2025-06-04")) == 12
+
+
+def test_bad_listen_address_is_reported_by_worker():
+    worker = IngestionWorker(SensorStore(["Pump-03"], 10), make_source("Socket (UDP)", "localhost")).start()
+    try:
+        wait_for(lambda: worker.snapshot()["Error"] is not None)
+    finally:
+        worker.stop()
+    assert "invalid listen port" in worker.snapshot()["Error"]
+
+
+def test_attached_stores_each_get_the_whole_feed():
+    source = QueueSource()
+    small = SensorStore(["Mixer-01"], 10)
+    worker = IngestionWorker(small, source, flush_interval=0.05).start()
+    try:
+        source.pending.put("Mixer-01,2025-06-03T12:00:00,70.0,0.5")
+        wait_for(lambda: small.written[0] == 1)
+        large = SensorStore(["Mixer-01", "Pump-03"], 10)
+        assert worker.attach(large) is worker
+        # Re-attaching the first store (another session's rerun) doesn't take the feed away
+        worker.attach(small)
+        source.pending.put("Mixer-01,2025-06-03T12:01:00,72.0,0.6")
+        source.pending.put("Pump-03,2025-06-03T12:01:00,88.0,0.6")
+        wait_for(lambda: worker.snapshot()["ingested"] == 3)
+    finally:
+        worker.stop()
+    assert small.written.tolist() == [2]
+    assert large.written.tolist() == [1, 1]
+    assert small.latest("Mixer-01")["Temperature (°F)"] == 72.0
+    assert large.latest("Pump-03")["Risk"] == "High"
+    assert worker.snapshot()["unknown"] == 0
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from maintenance_scheduler import MaintenanceScheduler
+from sensor_store import TEMP, SensorStore
+from shared_state import EventBus
+from ticket_store import TicketStore
+
+NOW = pd.Timestamp("2025-06-03 12:00")
+
+
+class FakeTicker:
+    def __init__(self, names, scores, severity, temps):
+        self.store = SensorStore(names, 4)
+        self.alert_engine = type("Alerts", (), {"severity": np.asarray(severity)})()
+        self._snapshot = {"scores": np.asarray(scores), "latest": {TEMP: np.asarray(temps, dtype=float)}}
+
+    def tick(self):
+        return self._snapshot
+
+
+def test_candidates_rank_and_cap():
+    scheduler = MaintenanceScheduler(None, threshold=60, max_per_cycle=2)
+    names = ["M-0", "M-1", "M-2", "M-3"]
+    found = scheduler.candidates(names, np.array([95, 10, 60, 50]), np.array([0, 0, 1, 2]),
+                                 np.array([70.0, 70.0, 80.0, 90.0]), NOW)
+    # M-1 is below threshold with no alert; the High alert lifts M-3 (50 + 25) above M-2 (60 + 10)
+    assert [(c["Machine"], c["Priority"]) for c in found] == [("M-0", 95), ("M-3", 75)]
+    assert found[0]["Due"] == "2025-06-03 16:00"
+    assert found[1]["Due"] == "2025-06-04 12:00"
+    assert found[0]["Reason"] == "Predicted failure risk 95%"
+    assert found[1]["Reason"] == "Bearing temp high"
+
+
+def test_cycle_creates_then_escalates(tmp_path):
+    tickets = TicketStore(tmp_path / "tickets.db")
+    bus = EventBus()
+    scheduler = MaintenanceScheduler(tickets, bus=bus)
+    ticker = FakeTicker(["M-0", "M-1", "M-2"], [80, 20, 70], [0, 0, 0], [70, 70, 70])
+    scheduler.tickers.add(ticker)
+    assert scheduler.cycle() == (2, 0)
+    # Same plan again changes nothing
+    assert scheduler.cycle() == (0, 0)
+    ticker._snapshot["scores"] = np.array([90, 20, 70])
+    assert scheduler.cycle() == (0, 1)
+    assert scheduler.last["At Risk"] == 2
+    assert [e["Created"] for e in bus.since(0, {"tickets_planned"})] == [2, 0]
+    open_tickets = tickets.page(limit=100, open_only=True)
+    assert set(open_tickets["Machine"]) >= {"M-0", "M-2"}
+    assert "M-1" not in set(open_tickets["Machine"])
+    assert open_tickets.loc[open_tickets["Machine"] == "M-0", "Priority"].item() == 90
+
+
+def test_cycle_plans_each_machine_once_across_fleets(tmp_path):
+    tickets = TicketStore(tmp_path / "tickets.db")
+    scheduler = MaintenanceScheduler(tickets)
+    small = FakeTicker(["M-0"], [65], [0], [70])
+    large = FakeTicker(["M-0", "M-1"], [80, 75], [0, 0], [70, 70])
+    scheduler.tickers.add(small)
+    scheduler.tickers.add(large)
+    assert scheduler.cycle() == (2, 0)
+    open_tickets = tickets.page(limit=100, open_only=True)
+    assert open_tickets.loc[open_tickets["Machine"] == "M-0", "Priority"].item() == 80
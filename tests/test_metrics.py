@@ -0,0 +1,35 @@
+import json
+
+from metrics import Metrics
+
+
+def test_disabled_records_nothing():
+    metrics = Metrics()
+    with metrics.stage("render"):
+        pass
+    metrics.count("ticks")
+    assert metrics.summary().empty
+    assert metrics.counters() == {}
+
+
+def test_enabled_stages_counters_and_exports(tmp_path):
+    metrics = Metrics(enabled=True)
+
+    @metrics.timed("section")
+    def section():
+        return 42
+
+    assert section() == 42
+    with metrics.stage("render"):
+        pass
+    metrics.count("ticks", 3)
+    summary = metrics.summary().set_index("Stage")
+    assert summary.loc["section", "Calls"] == 1 and summary.loc["render", "Calls"] == 1
+    text = metrics.prometheus()
+    assert 'pdm_stage_seconds_count{stage="render"} 1' in text
+    assert 'pdm_events_total{event="ticks"} 3' in text
+    metrics.append_json(tmp_path / "logs" / "metrics.jsonl")
+    line = json.loads((tmp_path / "logs" / "metrics.jsonl").read_text())
+    assert line["counters"] == {"ticks": 3}
+    metrics.reset()
+    assert metrics.summary().empty
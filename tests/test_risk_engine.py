@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from risk_engine import FleetRiskEngine, score_fleet, trailing_mean
+from sensor_store import SensorStore
+
+
+def test_trailing_mean_ignores_unwritten_slots():
+    matrix = np.array([[0.0, 0.0, 4.0, 6.0], [1.0, 2.0, 3.0, 4.0]])
+    assert list(trailing_mean(matrix, np.array([2, 4]), 4)) == [5.0, 2.5]
+
+
+def test_score_fleet_weights_temperature_and_vibration():
+    temps = np.array([[70.0] * 10, [100.0] * 10, [85.0] * 10])
+    vibs = np.array([[1.0] * 10, [3.0] * 10, [1.0] * 10])
+    assert list(score_fleet(temps, vibs)) == [0, 100, 30]
+
+
+def test_engine_rescores_only_when_the_store_changes():
+    store = SensorStore(["Mixer-01", "Pump-03"], 20)
+    times = pd.date_range("2025-06-03", periods=10, freq="min").values
+    store.append_fleet(times, np.full((2, 10), 70.0), np.full((2, 10), 1.0), np.zeros((2, 10), dtype=np.int8))
+    engine = FleetRiskEngine(store)
+    first = engine.scores()
+    assert engine.scores() is first
+    store.append("Pump-03", times[-1:] + np.timedelta64(1, "m"), [130.0], [1.0], [2])
+    assert list(engine.scores()) == [0, 12]
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from sensor_store import TEMP, VIB, SensorStore
+
+NOW = pd.Timestamp("2025-06-03 12:00")
+
+
+def samples(start, n):
+    times = (NOW + pd.to_timedelta(start + np.arange(n), unit="min")).values.astype("datetime64[ns]")
+    values = np.arange(start, start + n, dtype=float)
+    return times, values, values / 100, np.zeros(n, dtype=np.int8)
+
+
+def test_window_is_a_contiguous_view_after_wrapping():
+    store = SensorStore(["A"], 5)
+    store.append("A", *samples(0, 3))
+    store.append("A", *samples(3, 4))
+    window = store.window("A", TEMP)
+    assert window.base is store.values[TEMP]
+    assert list(window) == [2, 3, 4, 5, 6]
+    assert list(store.window("A", VIB, 2)) == [0.05, 0.06]
+    assert store.size("A") == 5
+    assert store.latest("A")[TEMP] == 6
+    assert store.frame("A", 3).index[-1] == NOW + pd.Timedelta(minutes=6)
+
+
+def test_append_longer_than_capacity_keeps_tail():
+    store = SensorStore(["A"], 4)
+    store.append("A", *samples(0, 10))
+    assert list(store.window("A", TEMP)) == [6, 7, 8, 9]
+    assert store.written[0] == 10
+
+
+def test_append_fleet_and_matrix():
+    store = SensorStore(["A", "B"], 4)
+    times, temps, vibs, risk = samples(0, 6)
+    store.append_fleet(times, np.vstack([temps, temps + 100]), np.vstack([vibs, vibs]), np.vstack([risk, risk]))
+    matrix, valid = store.matrix(TEMP, 3)
+    assert matrix.tolist() == [[3, 4, 5], [103, 104, 105]]
+    assert valid.tolist() == [3, 3]
+    assert store.latest_fleet()[TEMP].tolist() == [5, 105]
+
+
+def test_matrix_with_uneven_machines():
+    store = SensorStore(["A", "B"], 4)
+    store.append("A", *samples(0, 3))
+    store.append("B", *samples(10, 1))
+    matrix, valid = store.matrix(TEMP, 2)
+    assert valid.tolist() == [2, 1]
+    assert matrix[0].tolist() == [1, 2]
+    assert matrix[1, -1] == 10
+    rows_matrix, rows_valid = store.matrix(TEMP, 2, rows=np.array([1]))
+    assert rows_matrix[0, -1] == 10 and rows_valid.tolist() == [1]
+
+
+def test_append_samples_matches_per_machine_appends():
+    names = ["A", "B", "C"]
+    batched, serial = SensorStore(names, 3), SensorStore(names, 3)
+    rows = np.array([0, 1, 0, 0, 1, 0, 0])
+    times, temps, vibs, risk = samples(0, len(rows))
+    batched.append_samples(rows, times, temps, vibs, risk)
+    for i, name in enumerate(names):
+        serial.append(name, times[rows == i], temps[rows == i], vibs[rows == i], risk[rows == i])
+    for name in names:
+        assert list(batched.window(name, TEMP)) == list(serial.window(name, TEMP))
+    assert batched.written.tolist() == [5, 2, 0]
+    # Only machines that received samples get a new version
+    assert batched.versions.tolist() == [1, 1, 0]
+
+
+def test_reset_bumps_version():
+    store = SensorStore(["A"], 4)
+    store.append("A", *samples(0, 2))
+    before = store.versions[0]
+    store.reset("A")
+    assert store.size("A") == 0
+    store.append("A", *samples(0, 2))
+    # Same sample count as before the reset, but a reader can still tell it was rebuilt
+    assert store.written[0] == 2 and store.versions[0] == before + 2
@@ -0,0 +1,39 @@
+from shared_state import EventBus, SharedState
+
+
+def test_bus_since_filters_by_seq_and_topic():
+    bus = EventBus(history=3)
+    for machine in ["A", "B", "C", "D"]:
+        bus.publish("ack", Machine=machine)
+    bus.publish("repaired", Machine="A")
+    assert bus.last_seq() == 5
+    # Only the last 3 events are kept
+    assert [e["Machine"] for e in bus.since(0)] == ["C", "D", "A"]
+    assert [e["seq"] for e in bus.since(3, topics={"ack"})] == [4]
+
+
+def test_acknowledge_once():
+    shared = SharedState()
+    assert shared.acknowledge("Pump-07", "Operator")
+    assert not shared.acknowledge("Pump-07", "Maintenance")
+    assert shared.snapshot()["ack_log"] == {"Pump-07": "Operator"}
+
+
+def test_mark_repaired_clears_schedule():
+    shared = SharedState()
+    assert shared.schedule_repair("Pump-07", "Maintenance")
+    assert not shared.schedule_repair("Pump-07", "Maintenance")
+    shared.acknowledge("Pump-07", "Operator")
+    shared.mark_repaired("Pump-07", "Maintenance")
+    state = shared.snapshot()
+    assert "Pump-07" not in state["scheduled_repairs"]
+    assert "Pump-07" not in state["attn_from_operator"]
+    assert state["repaired_machines"] == {"Pump-07"}
+    # It can be scheduled again when it next fails
+    assert shared.schedule_repair("Pump-07", "Maintenance")
+
+
+def test_approve_publishes_event():
+    shared = SharedState()
+    shared.approve("MT-001", "Supervisor")
+    assert [(e["topic"], e["Ticket"]) for e in shared.bus.since(0)] == [("approved", "MT-001")]
@@ -0,0 +1,126 @@
+import io
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from ticket_store import COLUMNS, SEED_TICKETS, TicketStore
+
+
+def make_store(tmp_path):
+    return TicketStore(tmp_path / "tickets.db")
+
+
+def test_seeds_once(tmp_path):
+    make_store(tmp_path)
+    store = make_store(tmp_path)
+    assert store.count() == len(SEED_TICKETS)
+
+
+def test_schedule_repair_reuses_open_ticket(tmp_path):
+    store = make_store(tmp_path)
+    number = store.schedule_repair("Pump-07", "Bearing temp high")
+    assert number is not None
+    # Already Scheduled: a second request (e.g. after a restart) must not open another ticket
+    assert store.schedule_repair("Pump-07", "Bearing temp high") is None
+    open_tickets = store.page(limit=100, open_only=True)
+    assert (open_tickets["Machine"] == "Pump-07").sum() == 1
+    assert open_tickets.loc[open_tickets["Machine"] == "Pump-07", "Status"].item() == "Scheduled"
+
+
+def test_schedule_repair_escalates_queued_ticket(tmp_path):
+    store = make_store(tmp_path)
+    assert store.schedule_repair("Mixer-01", "Bearing wear") is None
+    page = store.page(limit=100)
+    assert page.loc[page["Ticket #"] == "MT-001", "Status"].item() == "Scheduled"
+
+
+def test_complete_then_reopen(tmp_path):
+    store = make_store(tmp_path)
+    store.schedule_repair("Pump-07", "Bearing temp high")
+    assert store.complete("Pump-07") == 1
+    assert store.schedule_repair("Pump-07", "Bearing temp high") is not None
+
+
+def test_approval_survives_restart(tmp_path):
+    store = make_store(tmp_path)
+    assert store.approve("MT-001") == 1
+    assert store.approve("MT-001") == 0
+    reopened = make_store(tmp_path)
+    assert "MT-001" not in set(reopened.page(limit=100, status="Queue")["Ticket #"])
+    page = reopened.page(limit=100)
+    assert page.loc[page["Ticket #"] == "MT-001", "Status"].item() == "Approved"
+
+
+def test_export_csv_returns_bytes(tmp_path):
+    store = make_store(tmp_path)
+    data = store.export_csv(chunk=2)
+    assert isinstance(data, bytes)
+    frame = pd.read_csv(io.BytesIO(data))
+    assert list(frame.columns) == COLUMNS
+    assert list(frame["Ticket #"]) == [t["Ticket #"] for t in SEED_TICKETS]
+
+
+def test_page_and_count(tmp_path):
+    store = make_store(tmp_path)
+    assert store.count("Queue") == 1
+    assert store.count(open_only=True) == 2
+    assert list(store.page(1, 1)["Ticket #"]) == ["MT-002"]
+
+
+def test_upgrade_closes_duplicate_open_tickets(tmp_path):
+    # A database written before the one-open-ticket-per-machine index existed
+    path = tmp_path / "tickets.db"
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE tickets (id INTEGER PRIMARY KEY AUTOINCREMENT, number TEXT UNIQUE, machine TEXT NOT NULL,
+                              type TEXT, reason TEXT, created TEXT, due TEXT, assigned_to TEXT, status TEXT NOT NULL);
+        INSERT INTO tickets (number, machine, type, reason, status) VALUES
+            ('MT-001', 'Pump-03', 'Reactive', 'Temp high', 'Scheduled'),
+            ('MT-002', 'Pump-03', 'Reactive', 'Temp high', 'Scheduled'),
+            ('MT-003', 'Pump-03', 'Corrective', 'Sensor fault', 'Completed'),
+            ('MT-004', 'Mixer-01', 'Predictive', 'Bearing wear', 'Queue');
+    """)
+    db.commit()
+    db.close()
+
+    store = TicketStore(path)
+    open_tickets = store.page(limit=100, open_only=True)
+    assert sorted(open_tickets["Ticket #"]) == ["MT-001", "MT-004"]
+    # Closed as a duplicate, not passed off as a finished repair
+    assert list(store.page(limit=100, status="Duplicate")["Ticket #"]) == ["MT-002"]
+    assert list(store.page(limit=100, status="Completed")["Ticket #"]) == ["MT-003"]
+    assert store.count(open_only=True) == 2
+    assert store.schedule_repair("Pump-03", "Temp high") is None
+
+
+def test_upgrade_relabels_duplicates_closed_as_completed(tmp_path):
+    path = tmp_path / "tickets.db"
+    make_store(tmp_path)
+    db = sqlite3.connect(path)
+    db.execute("UPDATE tickets SET status = 'Completed', reason = reason || ' (duplicate, closed)' "
+               "WHERE number = 'MT-002'")
+    db.commit()
+    db.close()
+    store = TicketStore(path)
+    assert list(store.page(limit=100, status="Duplicate")["Ticket #"]) == ["MT-002"]
+    # A Duplicate doesn't count as the machine's open ticket
+    assert store.create({"Machine": "Conveyor-02", "Type": "Reactive", "Status": "Queue"}) is not None
+
+
+def test_open_ticket_per_machine_is_enforced(tmp_path):
+    store = make_store(tmp_path)
+    with pytest.raises(sqlite3.IntegrityError):
+        store.create({"Machine": "Mixer-01", "Type": "Reactive", "Status": "Queue"})
+
+
+def test_plan_repairs_creates_then_escalates(tmp_path):
+    store = make_store(tmp_path)
+    plan = [{"Machine": "Pump-07", "Priority": 80, "Due": "2025-06-05 10:00", "Reason": "Predicted failure risk 80%"},
+            {"Machine": "Mixer-01", "Priority": 95, "Due": "2025-06-03 12:00", "Reason": "High"}]
+    assert store.plan_repairs(plan, ["Ali", "Maria"]) == (1, 1)
+    # Same plan again changes nothing
+    assert store.plan_repairs(plan, ["Ali", "Maria"]) == (0, 0)
+    queue = store.page(limit=10, order="priority", open_only=True)
+    assert list(queue["Machine"][:2]) == ["Mixer-01", "Pump-07"]
+    assert queue.loc[queue["Machine"] == "Mixer-01", "Due"].item() == "2025-06-03 12:00"
@@ -0,0 +1,214 @@
+import csv
+import heapq
+import io
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+COLUMNS = ["Ticket #", "Machine", "Type", "Reason", "Created", "Due", "Assigned To", "Status", "Priority"]
+_FIELDS = ["number", "machine", "type", "reason", "created", "due", "assigned_to", "status", "priority"]
+_SELECT = "SELECT " + ", ".join(_FIELDS) + " FROM tickets"
+# Work queue order: most urgent first, undated ("-") tickets after dated ones
+ORDERS = {"id": "id", "priority": "priority DESC, due = '-', due, id"}
+# Closed tickets: finished repairs, and extra open tickets closed by the
+# one-open-ticket-per-machine migration (kept apart so they don't pass for repairs)
+_OPEN = "status NOT IN ('Completed', 'Duplicate')"
+
+SEED_TICKETS = [
+    {"Ticket #": "MT-001", "Machine": "Mixer-01", "Type": "Predictive", "Reason": "Bearing wear", "Created": "2025-06-03 11:10", "Due": "2025-06-03 14:00", "Assigned To": "Ali", "Status": "Queue"},
+    {"Ticket #": "MT-002", "Machine": "Conveyor-02", "Type": "Preventive", "Reason": "Motor check", "Created": "2025-06-03 10:50", "Due": "2025-06-04 09:00", "Assigned To": "Maria", "Status": "Assigned"},
+    {"Ticket #": "MT-003", "Machine": "Pump-03", "Type": "Corrective", "Reason": "Sensor fault", "Created": "2025-06-02 15:15", "Due": "2025-06-03 11:00", "Assigned To": "Sohail", "Status": "Completed"}
+]
+
+
+# ----- Shared, durable maintenance tickets (SQLite in WAL mode) -----
+# One connection per thread; readers never block the writer. Ticket numbers come
+# from the AUTOINCREMENT rowid inside the inserting transaction, so concurrent
+# sessions can't hand out the same number.
+class TicketStore:
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                number TEXT UNIQUE,
+                machine TEXT NOT NULL,
+                type TEXT,
+                reason TEXT,
+                created TEXT,
+                due TEXT,
+                assigned_to TEXT,
+                status TEXT NOT NULL
+            );
+        """)
+        if "priority" not in [row[1] for row in db.execute("PRAGMA table_info(tickets)")]:
+            db.execute("ALTER TABLE tickets ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        # The partial unique index makes "one open ticket per machine" a hard guarantee.
+        # Databases from before it may already hold duplicates: keep each machine's
+        # oldest open ticket and mark the rest Duplicate, or creating the index would
+        # fail. Duplicates an earlier version of this closed as Completed (with the
+        # reason suffix below) get the Duplicate status too.
+        with self._write() as db:
+            db.execute(f"""
+                UPDATE tickets SET status = 'Duplicate'
+                WHERE {_OPEN}
+                  AND id NOT IN (SELECT MIN(id) FROM tickets WHERE {_OPEN} GROUP BY machine)
+            """)
+            db.execute("UPDATE tickets SET status = 'Duplicate' "
+                       "WHERE status = 'Completed' AND reason LIKE '% (duplicate, closed)'")
+        db.executescript(f"""
+            CREATE INDEX IF NOT EXISTS idx_tickets_machine_status ON tickets(machine, status);
+            CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);
+            CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority DESC, due);
+            DROP INDEX IF EXISTS idx_tickets_open_machine;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_tickets_one_open ON tickets(machine) WHERE {_OPEN};
+        """)
+        with self._write() as db:
+            if db.execute("SELECT COUNT(*) FROM tickets").fetchone()[0] == 0:
+                for ticket in SEED_TICKETS:
+                    self._insert(db, ticket)
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    class _Transaction:
+        def __init__(self, db):
+            self.db = db
+
+        def __enter__(self):
+            self.db.execute("BEGIN IMMEDIATE")
+            return self.db
+
+        def __exit__(self, exc_type, *_):
+            self.db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+    def _write(self):
+        return self._Transaction(self._db())
+
+    def _insert(self, db, ticket):
+        values = [ticket.get(column) for column in COLUMNS[:-1]] + [ticket.get("Priority", 0)]
+        cur = db.execute(
+            "INSERT INTO tickets (" + ", ".join(_FIELDS) + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", values)
+        if not ticket.get("Ticket #"):
+            number = f"MT-{cur.lastrowid:03d}"
+            db.execute("UPDATE tickets SET number = ? WHERE id = ?", (number, cur.lastrowid))
+            return number
+        return ticket["Ticket #"]
+
+    def create(self, ticket):
+        with self._write() as db:
+            return self._insert(db, ticket)
+
+    def schedule_repair(self, machine, reason):
+        # Reuse an open ticket for the machine if there is one (already Scheduled
+        # included), else open a new one
+        with self._write() as db:
+            updated = db.execute(
+                f"UPDATE tickets SET status = 'Scheduled' WHERE machine = ? AND {_OPEN}",
+                (machine,)).rowcount
+            if updated:
+                return None
+            return self._insert(db, {
+                "Machine": machine,
+                "Type": "Reactive",
+                "Reason": reason,
+                "Created": time.strftime('%Y-%m-%d %H:%M'),
+                "Due": "-",
+                "Assigned To": "-",
+                "Status": "Scheduled"
+            })
+
+    def approve(self, number):
+        # Only a ticket still waiting in the queue can be approved; 0 means someone
+        # else got there first (or it has moved on)
+        with self._write() as db:
+            return db.execute("UPDATE tickets SET status = 'Approved' WHERE number = ? AND status = 'Queue'",
+                              (number,)).rowcount
+
+    def complete(self, machine):
+        with self._write() as db:
+            return db.execute(f"UPDATE tickets SET status = 'Completed' WHERE machine = ? AND {_OPEN}",
+                              (machine,)).rowcount
+
+    def plan_repairs(self, candidates, technicians):
+        # Bulk create/escalate in one transaction. `candidates` are dicts with
+        # Machine, Priority, Due and Reason, most urgent first. A machine with an
+        # open ticket only gets it escalated (higher priority, earlier due), so
+        # running the same plan twice changes nothing. New tickets go to the
+        # technician with the fewest open tickets at that point.
+        if not candidates:
+            return 0, 0
+        machines = [c["Machine"] for c in candidates]
+        marks = ", ".join("?" * len(machines))
+        with self._write() as db:
+            open_priority = dict(db.execute(
+                f"SELECT machine, priority FROM tickets WHERE {_OPEN} AND machine IN ({marks})", machines))
+            load = dict.fromkeys(technicians, 0)
+            for name, n in db.execute(
+                    f"SELECT assigned_to, COUNT(*) FROM tickets WHERE {_OPEN} GROUP BY assigned_to"):
+                if name in load:
+                    load[name] = n
+            workload = [(n, i, name) for i, (name, n) in enumerate(load.items())]
+            heapq.heapify(workload)
+            created = time.strftime('%Y-%m-%d %H:%M')
+            new, escalate = [], []
+            for c in candidates:
+                if c["Machine"] in open_priority:
+                    if c["Priority"] > open_priority[c["Machine"]]:
+                        escalate.append((c["Priority"], c["Due"], c["Due"], c["Machine"]))
+                    continue
+                n, i, technician = heapq.heappop(workload)
+                heapq.heappush(workload, (n + 1, i, technician))
+                new.append((c["Machine"], "Predictive", c["Reason"], created, c["Due"], technician, "Queue", c["Priority"]))
+            db.executemany(
+                "INSERT INTO tickets (machine, type, reason, created, due, assigned_to, status, priority) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", new)
+            db.execute("UPDATE tickets SET number = printf('MT-%03d', id) WHERE number IS NULL")
+            db.executemany(
+                "UPDATE tickets SET priority = ?, due = CASE WHEN due = '-' OR due > ? THEN ? ELSE due END "
+                f"WHERE {_OPEN} AND machine = ?", escalate)
+        return len(new), len(escalate)
+
+    @staticmethod
+    def _where(status, open_only):
+        if open_only:
+            return f" WHERE {_OPEN}", ()
+        return ("", ()) if status is None else (" WHERE status = ?", (status,))
+
+    def count(self, status=None, open_only=False):
+        where, args = self._where(status, open_only)
+        return self._db().execute(f"SELECT COUNT(*) FROM tickets{where}", args).fetchone()[0]
+
+    def page(self, offset=0, limit=50, status=None, order="id", open_only=False):
+        where, args = self._where(status, open_only)
+        rows = self._db().execute(f"{_SELECT}{where} ORDER BY {ORDERS[order]} LIMIT ? OFFSET ?",
+                                  (*args, limit, offset)).fetchall()
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+    def export_csv(self, chunk=5000):
+        # CSV bytes for st.download_button, built only when the button is clicked.
+        # Rows are fetched in chunks and encoded straight into one bytes buffer (no
+        # DataFrame, no intermediate str). This is not a stream: Streamlit keeps
+        # every download in memory while serving it, so the finished file is too.
+        out = io.BytesIO()
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        writer.writerow(COLUMNS)
+        cursor = self._db().execute(f"{_SELECT} ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                break
+            writer.writerows(rows)
+        text.flush()
+        return out.getvalue()
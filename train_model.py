@@ -0,0 +1,97 @@
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from fleet import FleetRegistry
+from history_store import HistoryStore
+from inference import FEATURE_WINDOW, MODEL_PATH, RiskModel, extract_features
+from sensor_store import SensorStore, TEMP, VIB
+from simulator import FleetSimulator
+
+# A window is labelled "at risk" when the machine crosses the failure
+# thresholds (the same ones the alerts use) within the next `horizon` samples.
+FAIL_TEMP = 85
+FAIL_VIB = 2.5
+
+
+def label_windows(temps, vibs, window, horizon, stride):
+    if len(temps) < window + horizon:
+        return None
+    starts = np.arange(0, len(temps) - window - horizon + 1, stride)
+    t_windows = sliding_window_view(temps, window)[starts]
+    v_windows = sliding_window_view(vibs, window)[starts]
+    future_t = sliding_window_view(temps[window:], horizon)[starts].max(axis=1)
+    future_v = sliding_window_view(vibs[window:], horizon)[starts].max(axis=1)
+    labels = ((future_t > FAIL_TEMP) | (future_v > FAIL_VIB)).astype(float)
+    return extract_features(t_windows, v_windows), labels
+
+
+def history_series(root, days):
+    history = HistoryStore(root)
+    end = pd.Timestamp.now()
+    for machine_dir in sorted(Path(root).iterdir()):
+        if machine_dir.is_dir() and not machine_dir.name.startswith("_"):
+            frame = history.read(machine_dir.name, end - pd.Timedelta(days=days), end)
+            yield frame[TEMP].values, frame[VIB].values
+
+
+def simulated_series(machines, samples, seed):
+    # Stand-in history when nothing has been recorded yet: a fleet run forward
+    # for `samples` minutes, including repairs so the model sees recoveries
+    registry = FleetRegistry(machines)
+    store = SensorStore(registry.names, samples)
+    simulator = FleetSimulator(store, registry.profiles, seed=seed)
+    start = pd.Timestamp("2025-01-01")
+    simulator.tick(start)
+    for name in registry.names[2::20]:
+        simulator.repair(name, start)
+    simulator.tick(start + pd.Timedelta(minutes=samples // 2))
+    for name in registry.names:
+        yield store.window(name, TEMP), store.window(name, VIB)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the failure-risk model from stored sensor history.")
+    parser.add_argument("--history", default=str(Path(__file__).parent / "history" / "simulator"),
+                        help="HistoryStore directory to train from")
+    parser.add_argument("--days", type=int, default=30, help="how many days of history to use")
+    parser.add_argument("--simulate", type=int, default=0, metavar="MACHINES",
+                        help="train on a simulated fleet of this size instead of stored history")
+    parser.add_argument("--horizon", type=int, default=30, help="samples ahead a failure counts for a window")
+    parser.add_argument("--stride", type=int, default=5, help="step between training windows")
+    parser.add_argument("--output", default=str(MODEL_PATH))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.simulate:
+        series = simulated_series(args.simulate, 480, args.seed)
+    else:
+        if not Path(args.history).exists():
+            parser.error(f"no history at {args.history}; run the dashboard first or pass --simulate")
+        series = history_series(args.history, args.days)
+
+    parts = [label_windows(t, v, FEATURE_WINDOW, args.horizon, args.stride) for t, v in series]
+    parts = [p for p in parts if p is not None]
+    if not parts:
+        parser.error("not enough samples to build a single training window")
+    features = np.concatenate([p[0] for p in parts])
+    labels = np.concatenate([p[1] for p in parts])
+
+    rng = np.random.default_rng(args.seed)
+    order = rng.permutation(len(labels))
+    split = int(len(order) * 0.8)
+    train, test = order[:split], order[split:]
+    started = time.perf_counter()
+    model = RiskModel.fit(features[train], labels[train])
+    accuracy = float(((model.predict_proba(features[test]) > 0.5) == labels[test]).mean()) if len(test) else float("nan")
+    model.save(args.output, accuracy=accuracy, positive_rate=labels.mean(), trained_at=str(pd.Timestamp.now()))
+    print(f"{len(labels)} windows ({labels.mean():.1%} at risk), fit in {time.perf_counter() - started:.1f}s, "
+          f"held-out accuracy {accuracy:.1%} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()